@@ -0,0 +1,475 @@
+r"""Нагрузочные замеры всех страниц ``blog`` и ``pages``.
+
+Каждый адрес запрашивается анонимно и от имени автора — через тестовый
+клиент Django (чистое время приложения), через WSGI- и через
+ASGI-сервер (вместе с разбором HTTP). Для каждого считаются p50, p99 и
+пропускная способность; результаты пишутся в JSON, а с ``--baseline``
+сравниваются с прошлым прогоном, и при регрессии скрипт завершается
+с кодом 1.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.run --generate --users 100000 --posts 1000000 \
+        --comments 10000000
+    python -m benchmarks.run --output benchmarks/results/base.json
+    python -m benchmarks.run --baseline benchmarks/results/base.json
+
+WSGI против ASGI с асинхронными страницами (``BLOG_ASYNC_VIEWS``)::
+
+    python -m benchmarks.run --modes wsgi --concurrency 16 \
+        --output benchmarks/results/wsgi.json
+    python -m benchmarks.run --modes asgi --concurrency 16 --async-views \
+        --baseline benchmarks/results/wsgi.json --baseline-mode wsgi
+
+Замеры идут на отдельной базе ``benchmarks/bench.sqlite3``
+(переменная ``BLOGICUM_BENCH_DB``), рабочая база не затрагивается.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from urllib.error import HTTPError
+from urllib.parse import unquote, urlencode
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "blogicum"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+NAMESPACES = ("blog", "pages")
+CLIENTS = ("anonymous", "author")
+QUERY_STRINGS = {"blog:search": "?" + urlencode({"q": "город"})}
+# Разница меньше этой считается шумом, даже если в процентах она велика.
+MIN_SIGNIFICANT_MS = 1.0
+
+
+def setup_django():
+    import django
+
+    django.setup()
+
+
+def iter_url_names(patterns, namespace=None):
+    from django.urls import URLResolver
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_url_names(
+                pattern.url_patterns, pattern.namespace or namespace)
+        elif namespace in NAMESPACES and pattern.name:
+            yield f"{namespace}:{pattern.name}", pattern.pattern.converters
+
+
+def get_samples():
+    """Значения параметров адресов: самые «тяжёлые» объекты набора.
+
+    Автор — тот, у кого больше всего публикаций (при ``--posts 1000000``
+    и перекосе по умолчанию — больше ста тысяч записей), публикация — самая
+    обсуждаемая из его видимых: страницы правки и удаления открываются
+    от его имени.
+    """
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    from blog.models import Category, Comment, Post
+
+    author = (
+        get_user_model().objects.annotate(total=Count("posts"))
+        .order_by("-total").first()
+    )
+    post = (
+        Post.objects.published().filter(author=author)
+        .order_by("-comment_count", "-pk").select_related("author").first()
+    )
+    if post is None:
+        raise SystemExit("В базе нет опубликованных записей, нужен "
+                         "--generate.")
+    category = (
+        Category.objects.filter(is_published=True)
+        .annotate(total=Count("posts")).order_by("-total").first()
+    )
+    comment = Comment.objects.filter(post=post).order_by("pk").first()
+    return {
+        "post_id": post.pk,
+        "username": post.author.username,
+        "category_slug": category.slug if category else "missing",
+        "comment_id": comment.pk if comment else 0,
+    }, post.author
+
+
+def collect_urls(samples):
+    from django.urls import get_resolver, reverse
+
+    urls = {}
+    for name, converters in iter_url_names(get_resolver().url_patterns):
+        missing = set(converters) - set(samples)
+        if missing:
+            raise SystemExit(f"Нет образца параметров {missing} для {name}: "
+                             f"дополните get_samples().")
+        kwargs = {key: samples[key] for key in converters}
+        urls[name] = reverse(name, kwargs=kwargs) + QUERY_STRINGS.get(
+            name, "")
+    return urls
+
+
+def summarize(latencies, statuses, elapsed):
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "status": Counter(statuses).most_common(1)[0][0],
+        "requests": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(cuts[49], 3),
+        "p99_ms": round(cuts[98], 3),
+        "rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+def measure(fetch, requests, warmup, concurrency=1):
+    for _ in range(warmup):
+        fetch()
+
+    def timed(_):
+        started = time.perf_counter()
+        status = fetch()
+        return (time.perf_counter() - started) * 1000, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies, statuses = zip(*results)
+    return summarize(latencies, statuses, elapsed)
+
+
+def make_clients(author):
+    from django.test import Client
+
+    # Ошибка страницы попадает в отчёт статусом 500, а не обрывает замер.
+    clients = {
+        label: Client(raise_request_exception=False) for label in CLIENTS}
+    clients["author"].force_login(author)
+    return clients
+
+
+def run_client(urls, clients, args):
+    results = {}
+    for name, url in urls.items():
+        for label in CLIENTS:
+            client = clients[label]
+            results[f"{name} [{label}]"] = measure(
+                lambda: client.get(url).status_code,
+                args.requests, args.warmup)
+    return results
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class WSGIServerThread:
+    def __init__(self):
+        from django.core.wsgi import get_wsgi_application
+
+        self.server = make_server("127.0.0.1", 0, get_wsgi_application(),
+                                  ThreadingWSGIServer, QuietHandler)
+        self.port = self.server.server_port
+        threading.Thread(
+            target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ASGIServerThread:
+    """HTTP/1.1-сервер для ASGI-приложения под стать wsgiref.
+
+    Соединение на запрос, разбор заголовков — не сложнее, чем у
+    ``ThreadingWSGIServer``, чтобы сравнение WSGI и ASGI не зависело от
+    сторонних серверов: их нет в requirements.txt.
+    """
+
+    def __init__(self):
+        from django.core.asgi import get_asgi_application
+
+        self.app = get_asgi_application()
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def stop(self):
+        async def close():
+            self.server.close()
+            await self.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def build_scope(self, head):
+        request_line, *lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        path, _, query = target.partition("?")
+        headers = []
+        for line in filter(None, lines):
+            name, _, value = line.partition(":")
+            headers.append((name.strip().lower().encode("latin-1"),
+                            value.strip().encode("latin-1")))
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": unquote(path),
+            "raw_path": path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", self.port),
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            scope = self.build_scope(head[:-4])
+            length = int(dict(scope["headers"]).get(b"content-length", 0))
+            body = await reader.readexactly(length)
+
+            async def receive():
+                return {"type": "http.request", "body": body}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    lines = [
+                        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"
+                        .encode(),
+                        *(name + b": " + value
+                          for name, value in message.get("headers", ())),
+                        b"Connection: close",
+                    ]
+                    writer.write(b"\r\n".join(lines) + b"\r\n\r\n")
+                else:
+                    writer.write(message.get("body", b""))
+
+            await self.app(scope, receive, send)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+SERVERS = {"wsgi": WSGIServerThread, "asgi": ASGIServerThread}
+
+
+def run_server(mode, urls, cookies, args):
+    server = SERVERS[mode]()
+    base = f"http://127.0.0.1:{server.port}"
+    opener = build_opener(NoRedirect)
+    headers = {
+        "anonymous": {},
+        "author": {"Cookie": "; ".join(
+            f"{key}={morsel.value}" for key, morsel in cookies.items())},
+    }
+
+    def fetch(url, label):
+        request = Request(base + url, headers=headers[label])
+        try:
+            with opener.open(request) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            return error.code
+
+    results = {}
+    try:
+        for name, url in urls.items():
+            for label in CLIENTS:
+                results[f"{name} [{label}]"] = measure(
+                    lambda: fetch(url, label),
+                    args.requests, args.warmup, args.concurrency)
+    finally:
+        server.stop()
+    return results
+
+
+def compare(current, baseline, tolerance, baseline_mode=None):
+    """Строки с описанием регрессий относительно ``baseline``.
+
+    ``baseline_mode`` сравнивает все режимы с одним режимом прошлого
+    прогона — например, ASGI с WSGI.
+    """
+    regressions = []
+    for mode, results in current["results"].items():
+        base_results = baseline.get("results", {}).get(
+            baseline_mode or mode, {})
+        for name, result in results.items():
+            base = base_results.get(name)
+            if base is None:
+                continue
+            for key in ("p50_ms", "p99_ms"):
+                limit = base[key] * (1 + tolerance)
+                if result[key] > max(limit, base[key] + MIN_SIGNIFICANT_MS):
+                    regressions.append(
+                        f"{mode} {name}: {key} {base[key]} -> {result[key]}")
+            if result["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{mode} {name}: rps {base['rps']} -> {result['rps']}")
+    return regressions
+
+
+def get_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_database(args):
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    call_command("migrate", verbosity=0)
+    if args.generate or not Post.objects.exists():
+        call_command(
+            "generate_blog_data", users=args.users, posts=args.posts,
+            comments=args.comments, categories=args.categories,
+            seed=args.seed,
+        )
+
+
+def get_dataset():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Comment, Post
+
+    return {
+        model._meta.label_lower: model.objects.count()
+        for model in (get_user_model(), Category, Post, Comment)
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--generate", action="store_true",
+                        help="Добавить синтетические данные перед замером.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Запросов на адрес и клиента.")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Параллельных запросов к WSGI- и "
+                             "ASGI-серверу.")
+    parser.add_argument("--modes", default="client,wsgi,asgi",
+                        help="Через запятую: client, wsgi, asgi.")
+    parser.add_argument("--async-views", action="store_true",
+                        help="Включить BLOG_ASYNC_VIEWS: асинхронные "
+                             "страницы для чтения.")
+    parser.add_argument("--only", default="",
+                        help="Мерить только адреса, в имени которых есть "
+                             "эта подстрока.")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--baseline-mode",
+                        help="С каким режимом прошлого прогона сравнивать, "
+                             "по умолчанию — с тем же.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Допустимое ухудшение, доля от прошлого.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.async_views:
+        os.environ["BLOGICUM_ASYNC_VIEWS"] = "1"
+    setup_django()
+    import django
+    from django.conf import settings
+
+    prepare_database(args)
+    samples, author = get_samples()
+    urls = {
+        name: url for name, url in collect_urls(samples).items()
+        if args.only in name
+    }
+    modes = args.modes.split(",")
+    report = {
+        "meta": {
+            "started": datetime.now(timezone.utc).isoformat(),
+            "revision": get_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "dataset": get_dataset(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "async_views": settings.BLOG_ASYNC_VIEWS,
+        },
+        "results": {},
+    }
+    clients = make_clients(author)
+    if "client" in modes:
+        report["results"]["client"] = run_client(urls, clients, args)
+    for mode in SERVERS:
+        if mode in modes:
+            report["results"][mode] = run_server(
+                mode, urls, clients["author"].cookies, args)
+
+    output = args.output or ROOT / "benchmarks" / "results" / (
+        datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    for mode, mode_results in report["results"].items():
+        for name, result in mode_results.items():
+            print(f"{mode:6} {name:45} {result['status']} "
+                  f"p50={result['p50_ms']:.1f}ms "
+                  f"p99={result['p99_ms']:.1f}ms rps={result['rps']:.0f}")
+    print(f"Результаты: {output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(
+            report, baseline, args.tolerance, args.baseline_mode)
+        if regressions:
+            print("Регрессии:", *regressions, sep="\n  ")
+            return 1
+        print("Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Настройки для замеров: отдельная база и боевой режим без DEBUG."""
+import os
+
+from blogicum.settings import *  # noqa: F401,F403
+from blogicum.settings import (
+    ALLOWED_HOSTS,
+    BASE_DIR,
+    DATABASES,
+    TEMPLATE_LOADERS,
+    TEMPLATES,
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [*ALLOWED_HOSTS, "testserver"]
+
+# В blogicum.settings загрузчики выбраны по его DEBUG.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    "OPTIONS": {
+        **TEMPLATES[0]["OPTIONS"],
+        "loaders": [
+            ("django.template.loaders.cached.Loader", TEMPLATE_LOADERS),
+        ],
+    },
+}]
+
+DATABASES = {
+    "default": {
+        **DATABASES["default"],
+        "NAME": os.environ.get(
+            "BLOGICUM_BENCH_DB",
+            BASE_DIR.parent / "benchmarks" / "bench.sqlite3",
+        ),
+    }
+}
+
+# Журнал медленных запросов замерам только мешает.
+BLOG_SLOW_REQUEST_MS = None
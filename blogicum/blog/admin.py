@@ -1,12 +1,107 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.text import Truncator
 
-from .models import Category, Comment, Location, Post
+from . import const
+from .cache import bump_feed_version
+from .exports import CONTENT_TYPES, iter_export
+from .jobs import schedule_renditions
+from .models import Category, Comment, ImageJob, Location, Post
+from .search import get_search_backend
+from .signals import bulk_deletion
+from .snapshots import invalidate_snapshots
 
 admin.site.empty_value_display = "Не задано"
 
 
+def export_action(kind, fmt):
+    """Действие, отдающее выбранные записи файлом по мере чтения из базы."""
+
+    @admin.action(description=f"Выгрузить выбранные в {fmt.upper()}")
+    def export(modeladmin, request, queryset):
+        response = StreamingHttpResponse(
+            iter_export(kind, fmt, queryset),
+            content_type=f"{CONTENT_TYPES[fmt]}; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{kind}.{fmt}"')
+        return response
+
+    export.__name__ = f"export_{fmt}"
+    return export
+
+
+class BulkModerationMixin:
+    """Публикация и снятие с публикации одним запросом к базе.
+
+    ``list_editable`` сохраняет строки по одной, с ``save()`` и сигналами;
+    действия ниже делают один UPDATE на всё выделение, в том числе на «все
+    записи» со всех страниц, а кэш лент и счётчики поправляют один раз в
+    конце. Так же, одним разом, обслуживается и удаление встроенным
+    действием «Удалить выбранные» — см. ``delete_queryset()``.
+    """
+
+    actions = ("publish_selected", "unpublish_selected")
+
+    @admin.action(description="Опубликовать выбранные",
+                  permissions=["change"])
+    def publish_selected(self, request, queryset):
+        self.run_bulk(request, queryset, self.bulk_update, is_published=True)
+
+    @admin.action(description="Снять с публикации выбранные",
+                  permissions=["change"])
+    def unpublish_selected(self, request, queryset):
+        self.run_bulk(request, queryset, self.bulk_update, is_published=False)
+
+    def run_bulk(self, request, queryset, operation, **kwargs):
+        count = self.apply_bulk(queryset, operation, **kwargs)
+        self.message_user(request, f"Обработано записей: {count}.",
+                          messages.SUCCESS)
+
+    def apply_bulk(self, queryset, operation, **kwargs):
+        with transaction.atomic():
+            count = self.bulk_change(queryset, operation, **kwargs)
+        # Сигналов не было — версию лент и снимки сбрасываем сами.
+        bump_feed_version()
+        invalidate_snapshots()
+        return count
+
+    def delete_queryset(self, request, queryset):
+        """Удаление для встроенного действия «Удалить выбранные».
+
+        Django вызывает его после страницы подтверждения, проверки прав на
+        связанные записи, запрета PROTECT/RESTRICT и записи в журнал
+        админки. Каскад разбирает ``Collector`` в ``QuerySet.delete()``.
+        """
+        self.apply_bulk(queryset, self.bulk_delete)
+
+    def bulk_change(self, queryset, operation, **kwargs):
+        """Точка расширения: что пересчитать вокруг ``operation``."""
+        return operation(queryset, **kwargs)
+
+    def bulk_update(self, queryset, **values):
+        return queryset.update(**values)
+
+    def bulk_delete(self, queryset):
+        with bulk_deletion():
+            _, counts = queryset.delete()
+        return counts.get(queryset.model._meta.label, 0)
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(), required=False, label="Категория")
+
+
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkModerationMixin, admin.ModelAdmin):
     list_display = (
         "title", "description", "slug", "is_published", "created_at")
     list_editable = ("is_published",)
@@ -14,20 +109,59 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ("slug",)
     list_display_links = ("title",)
 
+    def bulk_update(self, queryset, **values):
+        # Ключи берём до UPDATE: после него фильтры списка могут перестать
+        # совпадать. Видимость публикаций всех категорий — одним UPDATE.
+        pks = list(queryset.values_list("pk", flat=True))
+        count = super().bulk_update(queryset, **values)
+        Post.objects.filter(category__in=pks).sync_visibility()
+        return count
+
+    def bulk_delete(self, queryset):
+        Post.objects.filter(category__in=queryset).update(is_visible=False)
+        return super().bulk_delete(queryset)
+
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(BulkModerationMixin, admin.ModelAdmin):
     list_display = ("name", "is_published", "created_at")
     list_editable = ("is_published",)
     search_fields = ("name",)
     list_display_links = ("name",)
 
 
+class PostChangeList(ChangeList):
+    def get_queryset(self, request):
+        # В списке вместо текста — готовая выжимка, полный текст не читаем.
+        return super().get_queryset(request).defer("text")
+
+
+class CommentPostFilter(admin.SimpleListFilter):
+    """Фильтр по публикации без списка всех публикаций в боковой панели.
+
+    Отбор включается ссылкой в колонке «Публикация»; в панели остаётся
+    только выбранная публикация, чтобы фильтр можно было сбросить.
+    """
+
+    title = "публикация"
+    parameter_name = "post"
+
+    def lookups(self, request, model_admin):
+        if not (self.value() or "").isdigit():
+            return ()
+        return Post.objects.filter(pk=self.value()).values_list("pk", "title")
+
+    def queryset(self, request, queryset):
+        if (self.value() or "").isdigit():
+            return queryset.filter(post_id=self.value())
+        return queryset
+
+
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BulkModerationMixin, admin.ModelAdmin):
     list_display = (
         "title",
-        "text",
+        "excerpt",
         "pub_date",
         "is_published",
         "created_at",
@@ -35,18 +169,131 @@ class PostAdmin(admin.ModelAdmin):
         "category",
         "location",
     )
-    list_editable = ("is_published", "category")
+    list_editable = ("is_published",)
+    list_select_related = ("author", "category", "location")
+    autocomplete_fields = ("author", "category", "location")
     search_fields = ("title",)
-    list_filter = ("category",)
+    list_filter = ("is_published", "category")
     list_display_links = ("title",)
+    date_hierarchy = "pub_date"
+    show_full_result_count = False
+    action_form = PostActionForm
+    actions = (
+        *BulkModerationMixin.actions,
+        "recategorize_selected",
+        export_action("posts", "jsonl"),
+        export_action("posts", "csv"),
+    )
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    @admin.action(description="Перенести выбранные в категорию",
+                  permissions=["change"])
+    def recategorize_selected(self, request, queryset):
+        field = self.action_form.base_fields["category"]
+        try:
+            category = field.clean(request.POST.get("category"))
+        except ValidationError:
+            category = None
+        if category is None:
+            self.message_user(request, "Выберите категорию для переноса.",
+                              messages.WARNING)
+            return
+        self.run_bulk(request, queryset, self.bulk_update, category=category)
+
+    def bulk_update(self, queryset, **values):
+        # Фильтры списка могут перестать совпадать после UPDATE, поэтому
+        # видимость пересчитываем по ключам, взятым до него.
+        pks = list(queryset.values_list("pk", flat=True))
+        # auto_now в update() не срабатывает, а updated_at входит в ETag
+        # ответов API.
+        count = super().bulk_update(
+            queryset, updated_at=timezone.now(), **values)
+        Post.objects.filter(pk__in=pks).sync_visibility()
+        return count
+
+    def bulk_delete(self, queryset):
+        pks = list(queryset.values_list("pk", flat=True))
+        count = super().bulk_delete(queryset)
+        backend = get_search_backend()
+        for start in range(0, len(pks), const.BATCH_SIZE):
+            backend.remove(pks[start:start + const.BATCH_SIZE])
+        return count
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по индексу вместо LIKE '%…%' по каждому search_fields.
+        if not search_term.strip():
+            return queryset, False
+        return get_search_backend().search(queryset, search_term), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if "image" in form.changed_data:
+            schedule_renditions(obj)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BulkModerationMixin, admin.ModelAdmin):
     list_display = (
-        "text",
+        "short_text",
+        "post_link",
         "author",
         "is_published",
+        "created_at",
     )
     list_editable = ("is_published",)
-    list_filter = ("post",)
+    list_select_related = ("author", "post")
+    autocomplete_fields = ("post", "author")
+    list_filter = (CommentPostFilter, "is_published")
+    date_hierarchy = "created_at"
+    show_full_result_count = False
+    actions = (
+        *BulkModerationMixin.actions,
+        export_action("comments", "jsonl"),
+        export_action("comments", "csv"),
+    )
+
+    @admin.display(description="Текст")
+    def short_text(self, obj):
+        return Truncator(obj.text).chars(const.ADMIN_TEXT_LENGTH)
+
+    @admin.display(description="Публикация", ordering="post")
+    def post_link(self, obj):
+        return format_html('<a href="?post={}">{}</a>', obj.post_id, obj.post)
+
+    def save_model(self, request, obj, form, change):
+        post_ids = {obj.post_id}
+        if change and "post" in form.changed_data:
+            post_ids.add(form.initial["post"])
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if not change or {"post", "is_published"} & set(
+                    form.changed_data):
+                Post.objects.filter(pk__in=post_ids).repair_comment_counts()
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            Post.objects.filter(pk=obj.post_id).repair_comment_counts()
+
+    def bulk_change(self, queryset, operation, **kwargs):
+        post_ids = list(
+            queryset.order_by().values_list("post_id", flat=True).distinct())
+        count = super().bulk_change(queryset, operation, **kwargs)
+        Post.objects.filter(pk__in=post_ids).repair_comment_counts()
+        return count
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "post",
+        "status",
+        "attempts",
+        "run_after",
+        "last_error",
+    )
+    list_filter = ("status",)
+    list_select_related = ("post",)
+    readonly_fields = ("locked_at", "created_at")
@@ -0,0 +1,107 @@
+"""Read-only JSON API поверх тех же представлений, что и HTML-страницы.
+
+Видимость и постраничный вывод наследуются от представлений ``views``,
+поэтому API не может показать больше, чем сайт. Ответы несут сильный
+ETag, а на совпавший ``If-None-Match`` возвращается 304 без сборки JSON.
+"""
+import hashlib
+
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .serializers import (
+    comment_version,
+    post_version,
+    serialize_comment,
+    serialize_post,
+)
+from .views import (
+    CategoryPostListView,
+    CommentListView,
+    PostDetailView,
+    PostListView,
+    ProfileView,
+)
+
+
+def make_etag(versions):
+    return quote_etag(hashlib.md5(repr(versions).encode()).hexdigest())
+
+
+class JsonApiMixin:
+    json_dumps_params = {"ensure_ascii": False, "separators": (",", ":")}
+
+    def get_etag(self):
+        # Сильный ETag API считается по строкам ответа в json_response().
+        return None
+
+    def json_response(self, versions, build_payload):
+        etag = make_etag(versions)
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = JsonResponse(
+                build_payload(), json_dumps_params=self.json_dumps_params)
+        response["ETag"] = etag
+        return response
+
+
+class PostFeedApiMixin(JsonApiMixin):
+    """Лента публикаций в JSON; страницы всегда листаются по курсору."""
+
+    cursor_pagination = True
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context["page_obj"]
+        posts = context["object_list"]
+        return self.json_response(
+            (
+                [post_version(post) for post in posts],
+                page.next_cursor,
+                page.previous_cursor,
+            ),
+            lambda: {
+                "results": [serialize_post(post) for post in posts],
+                "next_cursor": page.next_cursor,
+                "previous_cursor": page.previous_cursor,
+            },
+        )
+
+
+class PostListApiView(PostFeedApiMixin, PostListView):
+    pass
+
+
+class CategoryPostListApiView(PostFeedApiMixin, CategoryPostListView):
+    pass
+
+
+class ProfileApiView(PostFeedApiMixin, ProfileView):
+    pass
+
+
+class PostDetailApiView(JsonApiMixin, PostDetailView):
+    def get_context_data(self, **kwargs):
+        # Комментарии отдаются отдельным адресом, здесь они не нужны.
+        return {"post": self.object}
+
+    def render_to_response(self, context, **response_kwargs):
+        post = context["post"]
+        return self.json_response(
+            post_version(post),
+            lambda: serialize_post(post, full=True),
+        )
+
+
+class CommentListApiView(JsonApiMixin, CommentListView):
+    def render_to_response(self, post, page):
+        return self.json_response(
+            (
+                [comment_version(comment) for comment in page],
+                page.next_cursor,
+            ),
+            lambda: {
+                "results": [serialize_comment(comment) for comment in page],
+                "next_cursor": page.next_cursor,
+            },
+        )
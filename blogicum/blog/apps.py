@@ -5,3 +5,8 @@ class BlogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "blog"
     verbose_name = "Блог"
+
+    def ready(self):
+        # metrics — до первого соединения с БД: обёртку для счёта SQL
+        # соединение получает при открытии.
+        from . import metrics, signals  # noqa: F401
@@ -0,0 +1,87 @@
+"""Асинхронные страницы для чтения — для запуска под ASGI.
+
+У ORM в Django 3.2 нет асинхронного API, поэтому каждое представление
+ниже делает всю работу с БД и отрисовку шаблона за один переход в поток
+(``sync_to_async``): внутри — тот же класс из ``blog.views`` со всеми его
+кэшами и проверками. Синхронное представление стоило бы ASGI-обработчику
+двух переходов: на сам вызов и на ``render()`` ответа.
+
+Анонимному посетителю без cookie сессии страница из кэша
+(``AnonymousPageCacheMixin``) отдаётся прямо в цикле событий: кэш не
+ходит в БД, а без сессии пользователь заведомо аноним. Исключение —
+запрос, на котором подошла очередь планировщика: он идёт обычным путём
+и переводит наступившие отложенные публикации.
+
+Включаются настройкой ``BLOG_ASYNC_VIEWS`` (переменная окружения
+``BLOGICUM_ASYNC_VIEWS=1``).
+"""
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import scheduler
+from .cache import page_cache_key
+from .mixins import AnonymousPageCacheMixin, get_cached_page
+from .views import (
+    CategoryPostListView,
+    PostDetailView,
+    PostListView,
+    ProfileView,
+)
+
+
+def detach(response):
+    """Отрисованный ответ без ``render()``.
+
+    Увидев ``render()``, ASGI-обработчик ещё раз уйдёт в поток, чтобы его
+    вызвать, даже если шаблон уже отрисован.
+    """
+    if not callable(getattr(response, "render", None)):
+        return response
+    plain = HttpResponse(response.content, status=response.status_code,
+                         headers=response.headers)
+    plain.cookies = response.cookies
+    return plain
+
+
+def render_view(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if callable(getattr(response, "render", None)):
+        response.render()
+    return detach(response)
+
+
+def skips_thread(request):
+    """Можно ли искать страницу в кэше, не уходя в поток."""
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and not (settings.BLOG_INLINE_SCHEDULER
+                 and cache.get(scheduler.TICK_KEY) is None)
+    )
+
+
+def async_view(view_class, **initkwargs):
+    """Асинхронное представление поверх синхронного ``view_class``."""
+    view = view_class.as_view(**initkwargs)
+    cached = issubclass(view_class, AnonymousPageCacheMixin)
+
+    async def view_func(request, *args, **kwargs):
+        if cached and skips_thread(request):
+            response = get_cached_page(request, page_cache_key(request))
+            if response is not None:
+                return detach(response)
+        return await sync_to_async(render_view, thread_sensitive=True)(
+            view, request, *args, **kwargs)
+
+    update_wrapper(view_func, view)
+    return view_func
+
+
+post_list = async_view(PostListView)
+category_posts = async_view(CategoryPostListView)
+post_detail = async_view(PostDetailView)
+profile = async_view(ProfileView)
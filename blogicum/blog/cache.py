@@ -0,0 +1,30 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+FEED_VERSION_KEY = "blog:feed_version"
+
+
+def get_feed_version():
+    """Текущая версия лент; входит в ключи всего, что кэшируется по ним."""
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        # Начинаем со времени, а не с единицы: если ключ вытеснили из кэша,
+        # новая версия не совпадёт ни с одной из уже выданных.
+        version = time.time_ns()
+        cache.add(FEED_VERSION_KEY, version, None)
+    return version
+
+
+def bump_feed_version():
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        get_feed_version()
+
+
+def page_cache_key(request):
+    """Ключ страницы целиком: адрес с GET-параметрами и версия лент."""
+    url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"blog:page:{get_feed_version()}:{url}"
@@ -3,3 +3,19 @@ CAT_LENGTH: int = 64
 POSTS_COUNT: int = 5
 PAGINATE_BY: int = 10
 MAX_MODELS_LENGTH: int = 30
+BATCH_SIZE: int = 1000
+COUNT_CACHE_TIMEOUT: int = 60
+PAGE_LINKS_ON_EACH_SIDE: int = 2
+EXCERPT_WORDS: int = 10
+PAGE_CACHE_TIMEOUT: int = 300
+FRAGMENT_CACHE_TIMEOUT: int = 900
+SCHEDULER_INTERVAL: int = 60
+IMAGE_JOB_MAX_ATTEMPTS: int = 5
+IMAGE_JOB_RETRY_DELAY: int = 30
+IMAGE_JOB_LOCK_TIMEOUT: int = 600
+IMAGE_JOB_CONCURRENCY: int = 2
+COMMENTS_PAGINATE_BY: int = 20
+ADMIN_TEXT_LENGTH: int = 60
+FEED_SNAPSHOT_SIZE: int = 1000
+FEED_SNAPSHOT_TIMEOUT: int = PAGE_CACHE_TIMEOUT
+FEED_SNAPSHOT_LOCK_TIMEOUT: int = 5
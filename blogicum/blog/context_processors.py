@@ -0,0 +1,11 @@
+from django.utils.functional import SimpleLazyObject
+
+from . import const
+from .cache import get_feed_version
+
+
+def feed_cache(request):
+    return {
+        "feed_version": SimpleLazyObject(get_feed_version),
+        "fragment_cache_timeout": const.FRAGMENT_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,65 @@
+"""Чтение дампов в формате ``dumpdata`` без загрузки файла в память.
+
+Поддерживаются JSON-массив (как ``db.json``) и JSON Lines — по записи
+на строку. Файлы с расширением ``.gz`` распаковываются на лету.
+"""
+import gzip
+import json
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+READ_CHUNK_SIZE = 1 << 16
+
+
+def open_dump(path, mode="rt", **kwargs):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8", **kwargs)
+    return open(path, mode, encoding="utf-8", **kwargs)
+
+
+def is_jsonl(path):
+    return str(path).removesuffix(".gz").endswith(JSONL_SUFFIXES)
+
+
+def iter_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_array(stream, chunk_size=READ_CHUNK_SIZE):
+    """Отдавать элементы JSON-массива по одному, читая файл кусками."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while not buffer.strip():
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            raise ValueError("Дамп пуст.")
+        buffer += chunk
+    buffer = buffer.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Дамп должен быть JSON-массивом.")
+    buffer, eof = buffer[1:], False
+    while True:
+        buffer = buffer.lstrip().removeprefix(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Запись не дочитана — добавляем следующий кусок файла.
+            if eof:
+                raise ValueError("Дамп оборвался или повреждён.")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def iter_records(path):
+    with open_dump(path) as stream:
+        if is_jsonl(path):
+            yield from iter_jsonl(stream)
+        else:
+            yield from iter_json_array(stream)
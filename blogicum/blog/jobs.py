@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import const
+from .models import ImageJob, Post
+from .renditions import sync_renditions
+
+
+def schedule_renditions(post):
+    """Поставить обработку нового изображения публикации в очередь.
+
+    Запрос не ждёт Pillow: пока задача не выполнена, у публикации статус
+    «обрабатывается» и шаблоны показывают исходный файл. Если изображение
+    убрали, обрабатывать нечего — старые копии удаляются сразу: их список
+    остаётся в ``image_renditions``, пока его не очистит
+    ``sync_renditions()``.
+    """
+    if not post.image:
+        ImageJob.objects.filter(post=post, status="queued").delete()
+        sync_renditions(post)
+        post.image_status = Post.IMAGE_READY
+        post.save(update_fields=["image_status"])
+        return None
+    with transaction.atomic():
+        Post.objects.filter(pk=post.pk).update(image_status=Post.IMAGE_PENDING)
+        post.image_status = Post.IMAGE_PENDING
+        job = ImageJob.objects.filter(post=post, status="queued").first()
+        if job is None:
+            job = ImageJob.objects.create(post=post)
+    return job
+
+
+def requeue_stale_jobs():
+    """Вернуть в очередь задачи, брошенные упавшим обработчиком."""
+    stale_before = timezone.now() - timedelta(
+        seconds=const.IMAGE_JOB_LOCK_TIMEOUT)
+    return ImageJob.objects.filter(
+        status="running", locked_at__lt=stale_before
+    ).update(status="queued", locked_at=None)
+
+
+def claim_jobs(limit):
+    """Забрать до ``limit`` готовых к запуску задач.
+
+    Задача считается взятой, только если условный UPDATE со статусом
+    ``queued`` изменил строку, поэтому несколько обработчиков могут
+    работать с одной очередью без блокировок.
+    """
+    now = timezone.now()
+    candidates = ImageJob.objects.filter(
+        status="queued", run_after__lte=now
+    ).values_list("pk", flat=True)[:limit]
+    claimed = [
+        pk for pk in candidates
+        if ImageJob.objects.filter(pk=pk, status="queued").update(
+            status="running", locked_at=now, attempts=F("attempts") + 1)
+    ]
+    return list(ImageJob.objects.filter(pk__in=claimed).select_related("post"))
+
+
+def run_job(job):
+    """Выполнить задачу; при ошибке отложить повтор или сдаться."""
+    post = job.post
+    try:
+        sync_renditions(post)
+    except Exception as error:
+        job.last_error = f"{type(error).__name__}: {error}"
+        if job.attempts >= const.IMAGE_JOB_MAX_ATTEMPTS:
+            job.status = "failed"
+            Post.objects.filter(pk=post.pk).update(
+                image_status=Post.IMAGE_FAILED)
+        else:
+            job.status = "queued"
+            job.run_after = timezone.now() + timedelta(
+                seconds=const.IMAGE_JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+        job.locked_at = None
+        job.save(update_fields=(
+            "status", "last_error", "run_after", "locked_at"))
+        return False
+    post.image_status = Post.IMAGE_READY
+    post.save(update_fields=["image_status"])
+    job.status = "done"
+    job.locked_at = None
+    job.save(update_fields=("status", "locked_at"))
+    return True
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.const import BATCH_SIZE
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет анонсы публикаций, сохранённых до появления поля "
+        "`excerpt`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько публикаций обновлять одним запросом.",
+        )
+        parser.add_argument(
+            "--all", action="store_true", dest="rebuild",
+            help="Пересчитать анонсы у всех публикаций, а не только пустые.",
+        )
+
+    def handle(self, *args, batch_size, rebuild, **options):
+        posts = Post.objects.only("pk", "text").order_by("pk")
+        if not rebuild:
+            posts = posts.filter(excerpt="")
+        updated, last_pk = 0, 0
+        # Идём по диапазонам ключей, а не одним курсором: SQLite не изолирует
+        # чтение от записи в ту же таблицу внутри одного соединения.
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt = post.make_excerpt()
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ["excerpt"])
+            updated += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"Обновлено анонсов: {updated}."))
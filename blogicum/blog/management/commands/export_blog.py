@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.const import BATCH_SIZE
+from blog.dumps import open_dump
+from blog.exports import EXPORT_FORMATS, EXPORT_MODELS, iter_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает публикации или комментарии в JSON Lines или CSV. "
+        "Файл пишется построчно; с расширением .gz — сразу сжатым."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORT_MODELS),
+                            help="Что выгружать.")
+        parser.add_argument(
+            "-o", "--output",
+            help="Файл выгрузки; по умолчанию — стандартный вывод.",
+        )
+        parser.add_argument(
+            "--format", dest="fmt", choices=EXPORT_FORMATS,
+            help="Формат выгрузки; по умолчанию определяется по "
+                 "расширению файла, иначе jsonl.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=BATCH_SIZE,
+            help="Сколько строк читать из базы за раз.",
+        )
+
+    def handle(self, *args, kind, output, fmt, chunk_size, **options):
+        if fmt is None:
+            suffix = str(output or "").removesuffix(".gz")
+            fmt = "csv" if suffix.endswith(".csv") else "jsonl"
+        lines = iter_export(kind, fmt, chunk_size=chunk_size)
+        started = time.perf_counter()
+        if output is None:
+            self.write(self.stdout, lines)
+            return
+        # newline="" — переводы строк в CSV расставляет сам csv.writer.
+        with open_dump(output, "wt", newline="") as stream:
+            rows = self.write(stream, lines)
+        elapsed = time.perf_counter() - started
+        if fmt == "csv":
+            rows -= 1
+        self.stderr.write(self.style.SUCCESS(
+            f"{kind}: {rows} строк в {output} за {elapsed:.1f} с"))
+
+    @staticmethod
+    def write(stream, lines):
+        count = 0
+        for count, line in enumerate(lines, 1):
+            stream.write(line)
+        return count
@@ -0,0 +1,200 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import capfirst
+
+from blog.cache import bump_feed_version
+from blog.const import BATCH_SIZE
+from blog.models import Category, Comment, Location, Post
+from blog.search import get_search_backend
+from blog.snapshots import invalidate_snapshots
+
+User = get_user_model()
+
+WORDS = (
+    "город утро река дорога лес гора море поезд вокзал музей парк улица "
+    "мост площадь собор сад дом окно кофе книга письмо друг встреча "
+    "прогулка вечер ночь зима весна лето осень снег дождь солнце ветер "
+    "облако звезда фотография путешествие маршрут карта отпуск выставка "
+    "концерт театр кино рецепт ужин завтрак рынок музыка история новость "
+    "праздник погода работа проект идея вопрос ответ заметка впечатление"
+).split()
+
+MAX_TEXT_WORDS = 2000
+
+
+def zipf_weights(size, skew):
+    """Накопленные веса: первые элементы выбираются намного чаще прочих."""
+    return list(accumulate(1 / (rank ** skew) for rank in range(1, size + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими пользователями, категориями, "
+        "публикациями и комментариями для нагрузочных замеров. Авторы, "
+        "категории и комментируемые публикации распределены неравномерно, "
+        "как в живом блоге."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--locations", type=int, default=50)
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument("--comments", type=int, default=100_000)
+        parser.add_argument(
+            "--skew", type=float, default=1.1,
+            help="Показатель закона Ципфа для авторов, категорий и "
+                 "комментируемых публикаций; 0 — равномерно.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365,
+            help="За сколько дней до сегодняшнего распределить публикации.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько записей вставлять одним запросом.",
+        )
+        parser.add_argument(
+            "--no-search-index", dest="search_index", action="store_false",
+            help="Не индексировать публикации для поиска.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 and not User.objects.exists():
+            raise CommandError("Публикациям нужен хотя бы один автор.")
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.skew = options["skew"]
+        self.now = timezone.now()
+        self.days = options["days"]
+        started = time.perf_counter()
+
+        user_ids = self.create_or_reuse(
+            User, options["users"], self.build_user)
+        category_ids = self.create_or_reuse(
+            Category, options["categories"], self.build_category)
+        location_ids = self.create_or_reuse(
+            Location, options["locations"], self.build_location)
+        self.user_weights = zipf_weights(len(user_ids), self.skew)
+        self.category_weights = zipf_weights(len(category_ids), self.skew)
+        self.user_ids = user_ids
+        self.category_ids = category_ids
+        self.location_ids = location_ids
+        post_ids = self.create_or_reuse(
+            Post, options["posts"], self.build_post,
+            after_batch=(get_search_backend().index
+                         if options["search_index"] else None),
+        )
+        if post_ids:
+            Post.objects.filter(
+                pk__range=(post_ids[0], post_ids[-1])).sync_visibility()
+        if options["comments"] and not post_ids:
+            raise CommandError("Комментариям нужна хотя бы одна публикация.")
+        self.post_ids = post_ids
+        self.post_weights = zipf_weights(len(post_ids), self.skew)
+        self.create(Comment, options["comments"], self.build_comment)
+        if options["comments"]:
+            call_command("repair_comment_counts",
+                         batch_size=self.batch_size, stdout=self.stdout)
+        bump_feed_version()
+        invalidate_snapshots()
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово за {time.perf_counter() - started:.1f} с."))
+
+    def create_or_reuse(self, model, count, build, after_batch=None):
+        """Ключи новых записей, а если их не заказано — уже имеющихся."""
+        if count:
+            return self.create(model, count, build, after_batch)
+        return list(
+            model.objects.order_by("pk").values_list("pk", flat=True))
+
+    def create(self, model, count, build, after_batch=None):
+        """Вставить ``count`` записей пачками и вернуть диапазон их ключей.
+
+        Ключи назначаются подряд после наибольшего, так что список из базы
+        не нужен: на миллионах записей он занял бы сотни мегабайт.
+        """
+        first = (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+        started = time.perf_counter()
+        for start in range(first, first + count, self.batch_size):
+            stop = min(start + self.batch_size, first + count)
+            batch = [build(pk) for pk in range(start, stop)]
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+                if after_batch is not None:
+                    after_batch(batch)
+        if count:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{capfirst(model._meta.verbose_name_plural)}: {count} "
+                f"за {elapsed:.1f} с")
+        return range(first, first + count)
+
+    def words(self, low, high):
+        count = self.random.randint(low, high)
+        return " ".join(self.random.choices(WORDS, k=count))
+
+    def pick(self, ids, cum_weights):
+        return self.random.choices(ids, cum_weights=cum_weights)[0]
+
+    def build_user(self, pk):
+        return User(pk=pk, username=f"bench_user_{pk}",
+                    password=make_password(None))
+
+    def build_category(self, pk):
+        return Category(
+            pk=pk,
+            title=f"Категория {pk}",
+            description=self.words(5, 20),
+            slug=f"bench-category-{pk}",
+            # Скрытые категории прячут свои публикации из лент.
+            is_published=self.random.random() > 0.1,
+        )
+
+    def build_location(self, pk):
+        return Location(pk=pk, name=f"Место {pk}")
+
+    def build_post(self, pk):
+        # Немного отложенных публикаций впереди, остальные — в прошлом.
+        offset = self.random.uniform(-self.days, self.days * 0.01)
+        has_category = self.category_ids and self.random.random() > 0.05
+        has_location = self.location_ids and self.random.random() > 0.3
+        post = Post(
+            pk=pk,
+            title=self.words(2, 8).capitalize(),
+            # Длина текстов тоже неравномерна: длинных постов мало.
+            text=self.words(10, min(
+                int(20 + self.random.paretovariate(1.5)), MAX_TEXT_WORDS)),
+            pub_date=self.now + timedelta(days=offset),
+            is_published=self.random.random() > 0.05,
+            author_id=self.pick(self.user_ids, self.user_weights),
+            category_id=(
+                self.pick(self.category_ids, self.category_weights)
+                if has_category else None),
+            location_id=(
+                self.random.choice(self.location_ids)
+                if has_location else None),
+        )
+        post.excerpt = post.make_excerpt()
+        post.sync_status()
+        return post
+
+    def build_comment(self, pk):
+        return Comment(
+            pk=pk,
+            post_id=self.pick(self.post_ids, self.post_weights),
+            author_id=self.pick(self.user_ids, self.user_weights),
+            text=self.words(3, 30),
+            is_published=self.random.random() > 0.02,
+        )
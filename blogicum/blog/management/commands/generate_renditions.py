@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import bump_feed_version
+from blog.const import BATCH_SIZE
+from blog.models import Post
+from blog.renditions import render_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт уменьшенные копии изображений публикаций в нескольких "
+        "процессах."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count(),
+            help="Число процессов, обрабатывающих изображения.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько публикаций сохранять одним запросом.",
+        )
+        parser.add_argument(
+            "--all", action="store_true", dest="rebuild",
+            help="Пересоздать копии и у тех публикаций, где они уже есть.",
+        )
+
+    def handle(self, *args, workers, batch_size, rebuild, **options):
+        posts = Post.objects.exclude(image="").exclude(image=None).only(
+            "pk", "image", "image_renditions")
+        if not rebuild:
+            posts = posts.filter(image_renditions={})
+        done, failed, batch = 0, 0, []
+        # spawn, а не fork: дочерним процессам БД не нужна, и унаследованные
+        # соединения они могли бы закрыть за родителя.
+        pool = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+        # Публикации читаются потоком, а в пуле держится не больше двух
+        # заданий на процесс, так что память не растёт с числом картинок.
+        pending = deque()
+        with pool:
+            for post in posts.order_by("pk").iterator(chunk_size=batch_size):
+                # Хранилище передаётся из родителя: настройки, изменённые
+                # после запуска (например, MEDIA_ROOT в тестах), процессы
+                # не увидят.
+                pending.append((post, pool.submit(
+                    render_renditions, post.image.name, default_storage)))
+                if len(pending) >= 2 * workers:
+                    failed += self.collect(pending.popleft(), batch)
+                if len(batch) >= batch_size:
+                    done += self.flush(batch)
+            while pending:
+                failed += self.collect(pending.popleft(), batch)
+        done += self.flush(batch)
+        # bulk_update() сигналов не шлёт, а карточки в кэше фрагментов и
+        # страницы ещё показывают исходные картинки.
+        if done:
+            bump_feed_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Обработано изображений: {done}, с ошибками: {failed}."))
+
+    def collect(self, task, batch):
+        """Дождаться копий одной публикации; 1 — если обработка не удалась."""
+        post, future = task
+        try:
+            post.image_renditions = future.result()
+            post.image_status = Post.IMAGE_READY
+        except (OSError, ValueError) as error:
+            self.stderr.write(f"{post.image.name}: {error}")
+            return 1
+        batch.append(post)
+        return 0
+
+    @staticmethod
+    def flush(batch):
+        with transaction.atomic():
+            Post.objects.bulk_update(
+                batch, ["image_renditions", "image_status"])
+        count = len(batch)
+        batch.clear()
+        return count
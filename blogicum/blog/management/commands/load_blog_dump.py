@@ -0,0 +1,176 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import python
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.cache import bump_feed_version
+from blog.const import BATCH_SIZE
+from blog.dumps import iter_records
+from blog.models import Post
+from blog.search import get_search_backend
+from blog.snapshots import invalidate_snapshots
+
+LOADED_MODELS = (
+    "auth.user",
+    "blog.category",
+    "blog.location",
+    "blog.post",
+    "blog.comment",
+)
+
+
+@contextmanager
+def raw_timestamps(model):
+    """Сохранить даты из дампа: auto_now/auto_now_add их бы перезаписали."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Быстро загружает дамп категорий, местоположений, публикаций и "
+        "комментариев в формате dumpdata (JSON или JSON Lines, можно .gz)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Файлы дампа.")
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько записей вставлять одним запросом.",
+        )
+        parser.add_argument(
+            "--append", action="store_true",
+            help="Не сохранять ключи из дампа, а добавить записи после "
+                 "существующих. Родительские записи должны идти в дампе "
+                 "раньше ссылающихся на них.",
+        )
+
+    def handle(self, *args, paths, batch_size, append, **options):
+        self.batch_size = batch_size
+        self.append = append
+        self.models = {label: apps.get_model(label) for label in LOADED_MODELS}
+        # Старый ключ -> новый для каждой модели; нужен только с --append.
+        self.id_maps = defaultdict(dict)
+        self.next_pk = {}
+        self.counts = Counter()
+        self.elapsed = Counter()
+        self.skipped = 0
+        self.now = timezone.now()
+        started = time.perf_counter()
+        # Как loaddata: проверка внешних ключей откладывается до конца,
+        # чтобы публикации могли идти в дампе раньше своих авторов.
+        with ExitStack() as stack:
+            stack.enter_context(connection.constraint_checks_disabled())
+            for model in self.models.values():
+                stack.enter_context(raw_timestamps(model))
+            for path in paths:
+                self.load(path)
+        connection.check_constraints(
+            table_names=[model._meta.db_table
+                         for model in self.models.values()])
+        if not any(self.counts.values()):
+            raise CommandError("В дампе нет записей для загрузки.")
+        self.reset_sequences()
+        if self.counts["blog.post"] or self.counts["blog.category"]:
+            Post.objects.sync_visibility()
+        if self.counts["blog.comment"]:
+            call_command("repair_comment_counts", batch_size=batch_size,
+                         stdout=self.stdout)
+        bump_feed_version()
+        invalidate_snapshots()
+        elapsed = time.perf_counter() - started
+
+        for label in LOADED_MODELS:
+            if self.counts[label]:
+                self.stdout.write(self.format_rate(
+                    label, self.counts[label], self.elapsed[label]))
+        if self.skipped:
+            self.stdout.write(f"Пропущено записей других моделей: "
+                              f"{self.skipped}.")
+        self.stdout.write(self.style.SUCCESS(self.format_rate(
+            "Всего", sum(self.counts.values()), elapsed)))
+
+    @staticmethod
+    def format_rate(label, rows, seconds):
+        rate = rows / seconds if seconds else rows
+        return f"{label}: {rows} строк за {seconds:.1f} с ({rate:.0f} строк/с)"
+
+    def load(self, path):
+        label, batch = None, []
+        for record in iter_records(path):
+            if record["model"] not in self.models:
+                self.skipped += 1
+                continue
+            if record["model"] != label or len(batch) == self.batch_size:
+                self.flush(label, batch)
+                label, batch = record["model"], []
+            batch.append(self.build(record))
+        self.flush(label, batch)
+
+    def build(self, record):
+        (deserialized,) = python.Deserializer(
+            [record], ignorenonexistent=True)
+        obj = deserialized.object
+        model = type(obj)
+        for field in model._meta.concrete_fields:
+            if field.get_internal_type() == "DateTimeField" and (
+                    not field.null and getattr(obj, field.attname) is None):
+                # В старых дампах нет updated_at и подобных полей.
+                setattr(obj, field.attname, self.now)
+            elif field.is_relation:
+                id_map = self.id_maps[field.related_model._meta.label_lower]
+                value = getattr(obj, field.attname)
+                if value in id_map:
+                    setattr(obj, field.attname, id_map[value])
+        if self.append:
+            label = model._meta.label_lower
+            if label not in self.next_pk:
+                self.next_pk[label] = (
+                    model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+            self.id_maps[label][obj.pk] = obj.pk = self.next_pk[label]
+            self.next_pk[label] += 1
+        if isinstance(obj, Post):
+            # Сигналов и save() не будет — производные поля заполняем сами,
+            # а is_visible пересчитывается одним UPDATE после загрузки.
+            obj.excerpt = obj.make_excerpt()
+            obj.sync_status()
+        return obj
+
+    def flush(self, label, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        model = self.models[label]
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            if model is Post:
+                get_search_backend().index(batch)
+        self.counts[label] += len(batch)
+        self.elapsed[label] += time.perf_counter() - started
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), list(self.models.values()))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.const import IMAGE_JOB_CONCURRENCY, SCHEDULER_INTERVAL
+from blog.jobs import claim_jobs, requeue_stale_jobs, run_job
+
+
+def run_in_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        # У каждого потока своё соединение с БД — закрываем его сами.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Обрабатывает очередь изображений публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=IMAGE_JOB_CONCURRENCY,
+            help="Сколько изображений обрабатывать одновременно.",
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Не завершаться, а проверять очередь каждые --interval "
+                 "секунд.",
+        )
+        parser.add_argument(
+            "--interval", type=int, default=SCHEDULER_INTERVAL,
+            help="Пауза между проверками в режиме --loop, секунды.",
+        )
+
+    def handle(self, *args, concurrency, loop, interval, **options):
+        with ThreadPoolExecutor(concurrency) as pool:
+            while True:
+                requeue_stale_jobs()
+                jobs = claim_jobs(concurrency)
+                results = list(pool.map(run_in_thread, jobs))
+                if results:
+                    self.stdout.write(
+                        f"Обработано: {results.count(True)}, "
+                        f"с ошибками: {results.count(False)}."
+                    )
+                if jobs:
+                    continue
+                if not loop:
+                    return
+                time.sleep(interval)
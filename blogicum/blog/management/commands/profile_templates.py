@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from blog.metrics import profile_templates
+from blog.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает, сколько времени занимает отрисовка каждого шаблона "
+        "и include на страницах. По умолчанию — лента, страница "
+        "публикации и профиль её автора."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Адреса страниц.")
+        parser.add_argument("--repeat", type=int, default=20,
+                            help="Сколько раз запрашивать каждую страницу.")
+        parser.add_argument("--user",
+                            help="Смотреть страницы от имени пользователя.")
+        parser.add_argument(
+            "--warm", action="store_true",
+            help="Не очищать кэш перед запросами: мерить страницы такими, "
+                 "какими их видит повторный посетитель.",
+        )
+
+    def handle(self, *args, paths, repeat, user, warm, **options):
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        if user:
+            client.force_login(User.objects.get(username=user))
+        paths = paths or self.default_paths()
+        with profile_templates() as stats:
+            for path in paths:
+                for _ in range(repeat):
+                    if not warm:
+                        cache.clear()
+                    response = client.get(path)
+                    if response.status_code != 200:
+                        raise CommandError(
+                            f"{path}: ответ {response.status_code}.")
+        rows = sorted(stats.items(), key=lambda item: -item[1].own)
+        width = max(len(name) for name, _ in rows)
+        self.stdout.write(
+            f"{'Шаблон':{width}}  {'вызовов':>8}  {'всего, мс':>10}  "
+            f"{'свои, мс':>9}  {'на вызов, мс':>12}")
+        for name, entry in rows:
+            self.stdout.write(
+                f"{name:{width}}  {entry.calls:>8}  "
+                f"{entry.total * 1000:>10.1f}  {entry.own * 1000:>9.1f}  "
+                f"{entry.own * 1000 / entry.calls:>12.3f}")
+
+    @staticmethod
+    def default_paths():
+        post = Post.objects.published().order_by("-pub_date").first()
+        if post is None:
+            return [reverse("blog:index")]
+        return [
+            reverse("blog:index"),
+            post.get_absolute_url(),
+            reverse("blog:profile", args=[post.author.username]),
+        ]
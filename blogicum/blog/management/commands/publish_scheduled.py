@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.const import SCHEDULER_INTERVAL
+from blog.scheduler import publish_due_posts
+
+
+class Command(BaseCommand):
+    help = "Переводит наступившие отложенные публикации в ленту."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Не завершаться, а проверять публикации каждые --interval "
+                 "секунд.",
+        )
+        parser.add_argument(
+            "--interval", type=int, default=SCHEDULER_INTERVAL,
+            help="Пауза между проверками в режиме --loop, секунды.",
+        )
+
+    def handle(self, *args, loop, interval, **options):
+        while True:
+            published = publish_due_posts()
+            if published or not loop:
+                self.stdout.write(f"Опубликовано: {published}.")
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import bump_feed_version
+from blog.const import BATCH_SIZE
+from blog.models import Post
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Перестраивает поисковый индекс публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько публикаций индексировать за один раз.",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        backend = get_search_backend()
+        posts = Post.objects.only("pk", "title", "text").order_by("pk")
+        backend.clear()
+        indexed, last_pk = 0, 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                backend.index(batch)
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+        # Страницы поиска лежат в общем кэше страниц — сбрасываем его.
+        bump_feed_version()
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано публикаций: {indexed}."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from blog.const import BATCH_SIZE
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает денормализованные счётчики опубликованных "
+        "комментариев у публикаций."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Сколько публикаций обрабатывать в одной транзакции.",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        bounds = Post.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            self.stdout.write("Публикаций нет.")
+            return
+        repaired = 0
+        for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+            with transaction.atomic():
+                repaired += Post.objects.filter(
+                    pk__gte=start, pk__lt=start + batch_size
+                ).repair_comment_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Исправлено счётчиков: {repaired}."))
@@ -0,0 +1,308 @@
+"""Сколько запросов к БД и времени стоит каждая страница.
+
+``RequestMetricsMiddleware`` считает для запроса число и время SQL,
+время отрисовки шаблонов и общее время ответа, а ``MetricsTemplates`` —
+движок шаблонов, который сообщает ему о каждой отрисовке. SQL считает
+обёртка, которая ставится на каждое соединение с БД при его открытии и
+находит текущий запрос через ``ContextVar``: под ASGI запросы к БД идут
+в других потоках, чем сам middleware, а контекст туда переносится
+вместе с ``sync_to_async``. Итоги копятся
+по ``resolver_match.view_name`` в памяти процесса и отдаются персоналу
+представлением ``metrics_view``; при ``DEBUG`` те же цифры приходят в
+заголовке ``Server-Timing``, а медленные запросы пишутся в журнал
+вместе со списком SQL.
+"""
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+from django.template.base import Template
+
+logger = logging.getLogger("blog.metrics")
+
+# Верхние границы корзин гистограмм: миллисекунды и число запросов.
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+# Сколько SQL держать для журнала медленных запросов.
+MAX_LOGGED_QUERIES = 100
+
+current_metrics = ContextVar("blog_request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self, keep_queries=False):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.queries = [] if keep_queries else None
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.sql_count += 1
+            self.sql_time += duration
+            if self.queries is not None and (
+                    len(self.queries) < MAX_LOGGED_QUERIES):
+                self.queries.append((duration, sql))
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+
+    def as_dict(self):
+        labels = [f"le_{bound}" for bound in self.bounds] + ["inf"]
+        return dict(zip(labels, self.counts))
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+    def add(self, metrics, total_ms):
+        self.requests += 1
+        self.sql_count += metrics.sql_count
+        self.sql_ms += metrics.sql_time * 1000
+        self.template_ms += metrics.template_time * 1000
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.latency.add(total_ms)
+        self.queries.add(metrics.sql_count)
+
+    def as_dict(self):
+        def mean(value):
+            return round(value / self.requests, 2)
+
+        return {
+            "requests": self.requests,
+            "avg_queries": mean(self.sql_count),
+            "avg_sql_ms": mean(self.sql_ms),
+            "avg_template_ms": mean(self.template_ms),
+            "avg_total_ms": mean(self.total_ms),
+            "max_total_ms": round(self.max_ms, 2),
+            "latency_ms": self.latency.as_dict(),
+            "queries": self.queries.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """Итоги по представлениям; у каждого процесса сервера — свои."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def add(self, view_name, metrics, total_ms):
+        with self.lock:
+            if view_name not in self.views:
+                self.views[view_name] = ViewStats()
+            self.views[view_name].add(metrics, total_ms)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: stats.as_dict()
+                for name, stats in sorted(self.views.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Соединение переоткрывается между запросами — обёртка ставится раз.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """Ставится первым в ``MIDDLEWARE``, чтобы мерить весь ответ.
+
+    Работает и под WSGI, и под ASGI: синхронный middleware в начале
+    асинхронной цепочки стоил бы каждому запросу переходов между потоком
+    и циклом событий.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # По этому признаку Django узнаёт асинхронный middleware.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if hasattr(self, "_is_coroutine"):
+            return self.__acall__(request)
+        metrics, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    @staticmethod
+    def start():
+        threshold = getattr(settings, "BLOG_SLOW_REQUEST_MS", None)
+        metrics = RequestMetrics(keep_queries=threshold is not None)
+        return metrics, current_metrics.set(metrics)
+
+    def finish(self, request, response, metrics):
+        threshold = getattr(settings, "BLOG_SLOW_REQUEST_MS", None)
+        total_ms = metrics.total_time * 1000
+        match = request.resolver_match
+        view_name = match.view_name if match else "<unresolved>"
+        registry.add(view_name, metrics, total_ms)
+        if settings.DEBUG:
+            response["Server-Timing"] = ", ".join((
+                f'sql;dur={metrics.sql_time * 1000:.1f};'
+                f'desc="{metrics.sql_count} queries"',
+                f"tpl;dur={metrics.template_time * 1000:.1f}",
+                f"total;dur={total_ms:.1f}",
+            ))
+            response["X-Query-Count"] = metrics.sql_count
+        if threshold is not None and total_ms >= threshold:
+            self.log_slow_request(request, view_name, metrics, total_ms)
+        return response
+
+    @staticmethod
+    def log_slow_request(request, view_name, metrics, total_ms):
+        queries = "\n".join(
+            f"  {duration * 1000:.1f} ms: {sql}"
+            for duration, sql in metrics.queries
+        )
+        logger.warning(
+            "Медленный запрос %s %s (%s): %.0f ms, SQL: %s за %.0f ms, "
+            "шаблоны: %.0f ms\n%s",
+            request.method, request.get_full_path(), view_name, total_ms,
+            metrics.sql_count, metrics.sql_time * 1000,
+            metrics.template_time * 1000, queries,
+        )
+
+
+class MetricsTemplate(DjangoTemplate):
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.template_depth:
+            # Вложенная отрисовка уже входит во время внешней.
+            return super().render(context, request)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.template_depth -= 1
+
+
+class MetricsTemplates(DjangoTemplates):
+    """``DjangoTemplates``, отдающий шаблоны с замером времени отрисовки."""
+
+    def from_string(self, template_code):
+        return MetricsTemplate(
+            self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return MetricsTemplate(template.template, self)
+
+
+class TemplateStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.own = 0.0
+
+
+@contextmanager
+def profile_templates():
+    """Время каждого шаблона, include и inclusion-тега внутри блока.
+
+    ``total`` — вместе с вложенными шаблонами, ``own`` — без них. Подменяет
+    ``Template._render`` на время блока, поэтому годится для команд и
+    отладки, но не для работающего сервера.
+    """
+    stats = defaultdict(TemplateStats)
+    nested = []
+    original = Template._render
+
+    def render(template, context):
+        nested.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original(template, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = nested.pop()
+            if nested:
+                nested[-1] += elapsed
+            entry = stats[
+                template.origin.template_name or template.origin.name]
+            entry.calls += 1
+            entry.total += elapsed
+            entry.own += elapsed - children
+
+    Template._render = render
+    try:
+        yield stats
+    finally:
+        Template._render = original
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse({"views": registry.snapshot()},
+                        json_dumps_params={"ensure_ascii": False})
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:43
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Comment = apps.get_model("blog", "Comment")
+    Post = apps.get_model("blog", "Post")
+    published = (
+        Comment.objects.filter(post=models.OuterRef("pk"), is_published=True)
+        .order_by()
+        .values("post")
+        .annotate(total=models.Count("pk"))
+        .values("total")
+    )
+    Post.objects.update(
+        comment_count=Coalesce(models.Subquery(published), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Число опубликованных комментариев.",
+                verbose_name="Комментарии",
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
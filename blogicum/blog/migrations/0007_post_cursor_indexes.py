@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_feed_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_category_feed_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_author_idx",
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-pub_date", "-id"],
+                name="post_feed_cursor_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["category", "-pub_date", "-id"],
+                name="post_category_cursor_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="post_author_cursor_idx",
+            ),
+        ),
+    ]
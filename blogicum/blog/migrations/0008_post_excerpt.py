@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_cursor_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text=(
+                    "Начало текста для ленты; заполняется при сохранении."
+                ),
+                verbose_name="Анонс",
+            ),
+        ),
+    ]
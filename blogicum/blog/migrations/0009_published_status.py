@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:49
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def sync_status(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    now = timezone.now()
+    Post.objects.filter(pub_date__lte=now).update(status="published")
+    Post.objects.filter(pub_date__gt=now).update(status="scheduled")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_status, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_feed_cursor_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_category_cursor_idx",
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_published", True), ("status", "published")
+                ),
+                fields=["-pub_date", "-id"],
+                name="post_published_feed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_published", True), ("status", "published")
+                ),
+                fields=["category", "-pub_date", "-id"],
+                name="post_published_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "scheduled")),
+                fields=["pub_date"],
+                name="post_scheduled_idx",
+            ),
+        ),
+    ]
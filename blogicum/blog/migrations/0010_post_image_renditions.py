@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_published_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_renditions",
+            field=models.JSONField(
+                default=dict,
+                editable=False,
+                help_text="Уменьшенные копии изображения и их размеры.",
+                verbose_name="Варианты изображения",
+            ),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_post_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_status",
+            field=models.PositiveSmallIntegerField(
+                choices=[
+                    (0, "Обрабатывается"),
+                    (1, "Готово"),
+                    (2, "Ошибка обработки"),
+                ],
+                default=1,
+                editable=False,
+                verbose_name="Обработка изображения",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ImageJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "В очереди"),
+                            ("running", "Выполняется"),
+                            ("done", "Выполнено"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Попыток"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(
+                        blank=True, verbose_name="Последняя ошибка"
+                    ),
+                ),
+                (
+                    "run_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Запустить после",
+                    ),
+                ),
+                (
+                    "locked_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Взята в работу"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Добавлено"
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_jobs",
+                        to="blog.post",
+                        verbose_name="Публикация",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "обработка изображения",
+                "verbose_name_plural": "Очередь обработки изображений",
+                "ordering": ("run_after", "pk"),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="imagejob",
+            index=models.Index(
+                fields=["status", "run_after"], name="imagejob_queue_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_image_jobs"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comment",
+            name="comment_post_published_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["post", "created_at", "id"],
+                name="comment_post_cursor_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_comment_cursor_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_published", True), ("status", "published")
+                ),
+                fields=["-updated_at"],
+                name="post_published_updated_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_published", True), ("status", "published")
+                ),
+                fields=["category", "-updated_at"],
+                name="post_category_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:05
+
+from django.db import migrations
+
+# Основы слов пишет blog.search; после миграции индекс заполняет
+# команда reindex_search.
+CREATE_FTS_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts "
+    "USING fts5(title, text, tokenize='unicode61 remove_diacritics 2')"
+)
+DROP_FTS_TABLE = "DROP TABLE IF EXISTS blog_post_fts"
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(CREATE_FTS_TABLE)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(DROP_FTS_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_post_updated_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+def sync_visibility(apps, schema_editor):
+    Category = apps.get_model("blog", "Category")
+    Post = apps.get_model("blog", "Post")
+    Post.objects.filter(
+        is_published=True,
+        status="published",
+        category__in=Category.objects.filter(is_published=True),
+    ).update(is_visible=True)
+
+
+def visible_index(fields, name):
+    return migrations.AddIndex(
+        model_name="post",
+        index=models.Index(
+            condition=models.Q(("is_visible", True)),
+            fields=fields,
+            name=name,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_post_search_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_published_feed_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_published_category_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_published_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_category_updated_idx",
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="is_visible",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text=(
+                    "Опубликована, дата публикации наступила и категория "
+                    "опубликована; пересчитывается при сохранении."
+                ),
+                verbose_name="Видна в лентах",
+            ),
+        ),
+        migrations.RunPython(sync_visibility, migrations.RunPython.noop),
+        visible_index(["-pub_date", "-id"], "post_published_feed_idx"),
+        visible_index(["category", "-pub_date", "-id"],
+                      "post_published_category_idx"),
+        visible_index(["-updated_at"], "post_published_updated_idx"),
+        visible_index(["category", "-updated_at"],
+                      "post_category_updated_idx"),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0015_post_is_visible"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_visible", True)),
+                fields=["author", "-pub_date", "-id", "comment_count"],
+                name="post_author_visible_idx",
+            ),
+        ),
+    ]
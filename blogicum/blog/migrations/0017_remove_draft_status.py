@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:48
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def drop_drafts(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    drafts = Post.objects.filter(status="draft")
+    now = timezone.now()
+    published = list(
+        drafts.filter(pub_date__lte=now).values_list("pk", flat=True))
+    drafts.update(status="scheduled")
+    Post.objects.filter(pk__in=published).update(status="published")
+    Post.objects.filter(
+        pk__in=published, is_published=True, category__is_published=True,
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0016_post_author_visible_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_drafts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="post",
+            name="status",
+            field=models.CharField(
+                choices=[("published", "Published"),
+                         ("scheduled", "Scheduled")],
+                default="scheduled",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:50
+
+from django.db import migrations, models
+
+IMAGE_STATUSES = {"0": "pending", "1": "ready", "2": "failed"}
+
+
+def statuses_to_names(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    for number, name in IMAGE_STATUSES.items():
+        Post.objects.filter(image_status=number).update(image_status=name)
+
+
+def statuses_to_numbers(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    for number, name in IMAGE_STATUSES.items():
+        Post.objects.filter(image_status=name).update(image_status=number)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0017_remove_draft_status"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Обрабатывается"),
+                    ("ready", "Готово"),
+                    ("failed", "Ошибка обработки"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=10,
+                verbose_name="Обработка изображения",
+            ),
+        ),
+        migrations.RunPython(statuses_to_names, statuses_to_numbers),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0018_image_status_choices"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_published_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_category_updated_idx",
+        ),
+    ]
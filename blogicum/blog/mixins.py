@@ -1,25 +1,196 @@
-from django.db.models import Count, Q
-from django.utils import timezone
+import hashlib
 
-from .const import PAGINATE_BY
-from .models import Post
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import condition
+
+from . import const, scheduler
+from .cache import get_feed_version, page_cache_key
+from .models import Comment, Post
+from .paginators import (
+    CachedCountPaginator,
+    CommentCursorPaginator,
+    CursorPaginator,
+)
+from .snapshots import SnapshotPostList
+
+
+class PublishDueMixin:
+    """Переводит наступившие отложенные публикации в ленту из запроса.
+
+    Страховка на случай, когда ``publish_scheduled --loop`` не запущен:
+    проверка выполняется не чаще раза в ``const.SCHEDULER_INTERVAL``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if settings.BLOG_INLINE_SCHEDULER:
+            scheduler.tick()
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ConditionalPageMixin:
+    """Отвечает 304, если страница не менялась с прошлого визита.
+
+    ETag строится из версии лент, пользователя и адреса страницы: версия
+    меняется при любой правке публикаций, комментариев, категорий и при
+    работе планировщика, а страница у каждого пользователя своя. Считать
+    его можно без запросов к БД. ``Last-Modified`` не отдаётся: ни одна
+    дата в БД не сдвигается при всех этих изменениях, и клиент с одним
+    ``If-Modified-Since`` получал бы 304 на устаревшую страницу.
+    """
+
+    def get_etag(self):
+        value = "{}:{}:{}".format(
+            get_feed_version(),
+            self.request.user.pk,
+            self.request.get_full_path(),
+        )
+        return hashlib.md5(value.encode()).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        return condition(
+            etag_func=lambda *args, **kwargs: self.get_etag(),
+        )(super().dispatch)(request, *args, **kwargs)
+
+
+def get_cached_page(request, key):
+    """Страница из кэша анонимных страниц — или None, если её там нет."""
+    response = cache.get(key)
+    if response is None:
+        return None
+    # ETag сохранён вместе со страницей, так что 304 отдаётся без
+    # единого запроса к БД.
+    return get_conditional_response(
+        request, etag=response.get("ETag"), response=response)
+
+
+class AnonymousPageCacheMixin:
+    """Отдаёт анонимным посетителям страницу целиком из кэша.
+
+    Ключ включает версию лент, поэтому любое изменение публикаций,
+    комментариев, категорий или местоположений сбрасывает все страницы.
+    """
+
+    page_cache_timeout = const.PAGE_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or (
+                request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = get_cached_page(request, key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if getattr(response, "is_rendered", True):
+            cache.set(key, response, self.page_cache_timeout)
+        else:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, rendered, self.page_cache_timeout)
+            )
+        return response
+
+
+class MemoizedObjectMixin:
+    """Ищет объект страницы в БД один раз за запрос.
+
+    Поиск описывается в ``lookup_object()``, а ``get_object()`` отдаёт
+    запомненный результат, сколько бы раз его ни вызывали ``test_func``,
+    ``get_queryset``, ``get_context_data`` и сам generic view.
+    """
+
+    def lookup_object(self, queryset=None):
+        return super().get_object(queryset)
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, "_memoized_object"):
+            self._memoized_object = self.lookup_object(queryset)
+        return self._memoized_object
 
 
 class PostListMixin:
     model = Post
-    paginate_by = PAGINATE_BY
+    paginate_by = const.PAGINATE_BY
+    paginator_class = CachedCountPaginator
+
+    @property
+    def cursor_pagination(self):
+        return settings.BLOG_CURSOR_PAGINATION
+
+    def get_posts(self):
+        """Какие записи показать; порядок и связи добавит get_queryset()."""
+        return self.model.objects.published()
 
     def get_queryset(self):
-        return (
-            self.model.objects.filter(
-                pub_date__lte=timezone.now(),
-                is_published=True,
-                category__is_published=True,
-            )
-            .annotate(
-                comment_count=Count("comments",
-                                    filter=Q(comments__is_published=True))
-            )
-            .order_by("-pub_date")
-            .select_related()
+        return self.get_posts().order_by("-pub_date", "-pk").for_cards()
+
+    def get_count_cache_key(self):
+        """Ключ кэша числа публикаций: одна и та же лента — один ключ."""
+        return ":".join(
+            [type(self).__name__]
+            + [f"{key}={value}" for key, value in sorted(self.kwargs.items())]
+        )
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, cache_key=self.get_count_cache_key(),
+            **kwargs
         )
+
+    def get_snapshot_feed(self):
+        """Имя снимка ленты (см. ``blog.snapshots``) или None — без снимка."""
+        return None
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            feed = self.get_snapshot_feed()
+            if feed is not None:
+                queryset = SnapshotPostList(feed, queryset)
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset, page_size, cache_key=self.get_count_cache_key())
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cursor_pagination"] = self.cursor_pagination
+        page = context.get("page_obj")
+        if page is not None and not self.cursor_pagination:
+            context["page_range"] = list(
+                page.paginator.get_elided_page_range(
+                    page.number, on_each_side=const.PAGE_LINKS_ON_EACH_SIDE)
+            )
+        return context
+
+
+class CommentPageMixin:
+    """Одна страница опубликованных комментариев к публикации.
+
+    На странице публикации выводится только первая порция, остальные
+    подгружаются по курсору, так что ответ не растёт вместе с обсуждением.
+    """
+
+    comments_paginate_by = const.COMMENTS_PAGINATE_BY
+
+    def get_comments_page(self, post_id, cursor=None):
+        queryset = Comment.objects.filter(
+            post_id=post_id, is_published=True
+        ).select_related("author")
+        paginator = CommentCursorPaginator(
+            queryset, self.comments_paginate_by)
+        try:
+            return paginator.page(cursor)
+        except InvalidPage as e:
+            raise Http404(str(e))
@@ -1,7 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import Truncator
 
 from . import const
@@ -51,6 +53,10 @@ class Category(CommonInfo):
     class Meta:
         verbose_name = "категория"
         verbose_name_plural = "Категории"
+        indexes = (
+            models.Index(fields=("is_published",),
+                         name="category_published_idx"),
+        )
 
     def __str__(self):
         return Truncator(self.title).chars(const.MAX_MODELS_LENGTH)
@@ -60,15 +66,117 @@ class Category(CommonInfo):
                        kwargs={"category_slug": self.slug})
 
 
+# Видимость в лентах (запись и категория опубликованы, дата наступила)
+# хранится готовой в Post.is_visible, чтобы лентам не нужен был JOIN с
+# категорией. Её пересчитывают save(), сигналы категорий, планировщик и
+# массовые действия админки; ниже — поля записи, от которых она зависит.
+VISIBILITY_FIELDS = {"is_published", "status", "category"}
+PUBLISHED_POSTS = models.Q(is_visible=True)
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        """Публикации, видимые в лентах всем посетителям."""
+        return self.filter(PUBLISHED_POSTS)
+
+    def visible_to(self, user):
+        """Опубликованные записи и, для вошедшего автора, его черновики."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(models.Q(author=user) | PUBLISHED_POSTS)
+
+    def authored_by(self, author, viewer):
+        """Записи автора для его страницы.
+
+        Самому автору — все, включая черновики и отложенные, остальным —
+        только видимые в лентах. Запрос один и тот же, меняется условие.
+        """
+        posts = self.filter(author=author)
+        if viewer != author:
+            posts = posts.published()
+        return posts
+
+    def author_stats(self, author):
+        """Число видимых публикаций автора и комментариев к ним."""
+        return self.published().filter(author=author).aggregate(
+            posts=models.Count("pk"),
+            comments=Coalesce(models.Sum("comment_count"), 0),
+        )
+
+    def for_cards(self):
+        """Всё, что выводит карточка публикации, одним запросом.
+
+        Категория и местоположение могут быть пустыми, поэтому голый
+        ``select_related()`` их не подтягивает — перечисляем явно.
+        Полный текст карточке не нужен: она выводит ``excerpt``.
+        """
+        return self.select_related(
+            "author", "category", "location").defer("text")
+
+    def sync_visibility(self):
+        """Пересчитать ``is_visible`` одним UPDATE; возвращает число строк.
+
+        Категория проверяется подзапросом по ``category_id``: UPDATE в
+        Django не умеет JOIN.
+        """
+        return self.update(is_visible=models.Case(
+            models.When(
+                models.Q(
+                    is_published=True,
+                    status="published",
+                    category__in=Category.objects.filter(is_published=True),
+                ),
+                then=True,
+            ),
+            default=False,
+            output_field=models.BooleanField(),
+        ))
+
+    def shift_comment_count(self, delta):
+        """Сдвинуть счётчик опубликованных комментариев одним UPDATE."""
+        return self.update(comment_count=models.F("comment_count") + delta)
+
+    def repair_comment_counts(self):
+        """Пересчитать счётчики по таблице комментариев.
+
+        Обновляются только разошедшиеся строки; возвращает их число.
+        """
+        actual = Coalesce(
+            models.Subquery(
+                Comment.objects.filter(
+                    post=models.OuterRef("pk"), is_published=True
+                )
+                .order_by()
+                .values("post")
+                .annotate(total=models.Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        stale = self.annotate(actual=actual).exclude(
+            comment_count=models.F("actual"))
+        return self.model.objects.filter(
+            pk__in=models.Subquery(stale.values("pk"))
+        ).update(comment_count=actual)
+
+
 class Post(CommonInfo):
+    # Статус выводится из pub_date при сохранении (см. sync_status()),
+    # черновик — это is_published=False, отдельного статуса у него нет.
+    # Запись, созданную в обход save(), подхватит планировщик.
     STATUS_CHOICES = (
-        ("draft", "Draft"),
         ("published", "Published"),
         ("scheduled", "Scheduled"),
     )
     title = models.CharField(max_length=const.MAX_LENGTH,
                              verbose_name="Заголовок")
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.TextField(
+        default="",
+        editable=False,
+        verbose_name="Анонс",
+        help_text="Начало текста для ленты; заполняется при сохранении.",
+    )
     pub_date = models.DateTimeField(
         verbose_name="Дата и время публикации",
         help_text=(
@@ -97,18 +205,116 @@ class Post(CommonInfo):
         related_name="posts",
     )
     status = models.CharField(max_length=10,
-                              choices=STATUS_CHOICES, default="draft")
+                              choices=STATUS_CHOICES, default="scheduled")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
     image = models.ImageField(upload_to="post_images/", blank=True, null=True)
+    IMAGE_PENDING, IMAGE_READY, IMAGE_FAILED = "pending", "ready", "failed"
+    IMAGE_STATUS_CHOICES = (
+        (IMAGE_PENDING, "Обрабатывается"),
+        (IMAGE_READY, "Готово"),
+        (IMAGE_FAILED, "Ошибка обработки"),
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_READY,
+        editable=False,
+        verbose_name="Обработка изображения",
+    )
+    image_renditions = models.JSONField(
+        default=dict,
+        editable=False,
+        verbose_name="Варианты изображения",
+        help_text="Уменьшенные копии изображения и их размеры.",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Комментарии",
+        help_text="Число опубликованных комментариев.",
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Видна в лентах",
+        help_text=(
+            "Опубликована, дата публикации наступила и категория "
+            "опубликована; пересчитывается при сохранении."
+        ),
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
         default_related_name = "posts"
+        indexes = (
+            models.Index(fields=("-pub_date", "-id"),
+                         name="post_published_feed_idx",
+                         condition=PUBLISHED_POSTS),
+            models.Index(fields=("category", "-pub_date", "-id"),
+                         name="post_published_category_idx",
+                         condition=PUBLISHED_POSTS),
+            models.Index(fields=("pub_date",), name="post_scheduled_idx",
+                         condition=models.Q(status="scheduled")),
+            models.Index(fields=("author", "-pub_date", "-id"),
+                         name="post_author_cursor_idx"),
+            # Профиль для гостей: лента автора без чтения его черновиков.
+            # comment_count в конце ключа — счётчики шапки профиля
+            # считаются по одному индексу, без чтения строк таблицы.
+            models.Index(fields=("author", "-pub_date", "-id",
+                                 "comment_count"),
+                         name="post_author_visible_idx",
+                         condition=PUBLISHED_POSTS),
+        )
 
     def __str__(self):
-        return Truncator(self.title).chars(const.MAX_NAME_LENGTH)
+        return Truncator(self.title).chars(const.MAX_MODELS_LENGTH)
+
+    def make_excerpt(self):
+        return Truncator(self.text).words(const.EXCERPT_WORDS, truncate=" …")
+
+    def sync_status(self):
+        """Отложенная публикация ждёт планировщика, остальные — в ленте."""
+        if self.pub_date <= timezone.now():
+            self.status = "published"
+        else:
+            self.status = "scheduled"
+
+    def sync_visibility(self):
+        """Пересчитать ``is_visible`` одной записи по правилам выше."""
+        self.is_visible = bool(
+            self.is_published
+            and self.status == "published"
+            and self.category_id is not None
+            and self.category.is_published
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            extra = set()
+            if "text" in update_fields:
+                self.excerpt = self.make_excerpt()
+                extra.add("excerpt")
+            if "pub_date" in update_fields:
+                self.sync_status()
+                extra.add("status")
+            if VISIBILITY_FIELDS & {*update_fields, *extra}:
+                self.sync_visibility()
+                extra.add("is_visible")
+            kwargs["update_fields"] = {*update_fields, *extra}
+        else:
+            deferred = self.get_deferred_fields()
+            if "text" not in deferred:
+                self.excerpt = self.make_excerpt()
+            if "pub_date" not in deferred:
+                self.sync_status()
+            if not {"is_published", "status", "category_id"} & deferred:
+                self.sync_visibility()
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("blog:post_detail", kwargs={"post_id": self.pk})
@@ -124,8 +330,54 @@ class Comment(CommonInfo):
     class Meta:
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = (
+            # SQLite сравнивает булево поле без «= 1», поэтому столбец
+            # is_published в ключе не помог бы сортировке — только условие.
+            models.Index(
+                fields=("post", "created_at", "id"),
+                name="comment_post_cursor_idx",
+                condition=models.Q(is_published=True),
+            ),
+        )
+
+    def __str__(self):
+        # Без автора и публикации: в списках админки это запрос на строку.
+        return Truncator(self.text).chars(const.MAX_MODELS_LENGTH)
+
+
+class ImageJob(models.Model):
+    STATUS_CHOICES = (
+        ("queued", "В очереди"),
+        ("running", "Выполняется"),
+        ("done", "Выполнено"),
+        ("failed", "Ошибка"),
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name="Публикация",
+        related_name="image_jobs",
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES,
+                              default="queued", verbose_name="Статус")
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name="Попыток")
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    run_after = models.DateTimeField(default=timezone.now,
+                                     verbose_name="Запустить после")
+    locked_at = models.DateTimeField(null=True, blank=True,
+                                     verbose_name="Взята в работу")
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name="Добавлено")
+
+    class Meta:
+        verbose_name = "обработка изображения"
+        verbose_name_plural = "Очередь обработки изображений"
+        ordering = ("run_after", "pk")
+        indexes = (
+            models.Index(fields=("status", "run_after"),
+                         name="imagejob_queue_idx"),
+        )
 
     def __str__(self):
-        return (
-            f"Comment by {self.author.username} on {self.post} ",
-            f"text: {self.text}")
+        return f"{self.get_status_display()}: {self.post_id}"
@@ -0,0 +1,155 @@
+import hashlib
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from . import const
+from .cache import get_feed_version
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который кэширует COUNT(*) выборки на короткое время.
+
+    Значение живёт до ``const.COUNT_CACHE_TIMEOUT`` секунд и сбрасывается
+    при любом изменении публикаций или категорий, так что запрос на
+    подсчёт строк выполняется не на каждый показ страницы.
+    """
+
+    def __init__(self, object_list, per_page, cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        key = "blog:count:{}:{}".format(
+            get_feed_version(),
+            hashlib.md5(self.cache_key.encode()).hexdigest(),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, const.COUNT_CACHE_TIMEOUT)
+        return count
+
+
+def encode_cursor(obj, reverse=False, key_field="pub_date"):
+    key = getattr(obj, key_field).isoformat()
+    value = f"{'<' if reverse else '>'}{key}|{obj.pk}"
+    return urlsafe_base64_encode(value.encode())
+
+
+def decode_cursor(cursor):
+    """Вернуть ``(reverse, ключ, pk)`` или вызвать ``InvalidPage``."""
+    try:
+        value = urlsafe_base64_decode(cursor).decode()
+        key, pk = value[1:].split("|")
+        key, pk = parse_datetime(key), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        key = None
+    if key is None or value[0] not in "<>":
+        raise InvalidPage("Некорректный курсор")
+    return value[0] == "<", key, pk
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу ``(pub_date, id)`` вместо OFFSET.
+
+    Каждая страница — это диапазонное чтение по индексу ленты, поэтому
+    глубокие страницы стоят столько же, сколько первая. Общее число
+    публикаций берётся из кэша и служит только для информации.
+    """
+
+    key_field = "pub_date"
+    descending = True
+
+    def __init__(self, queryset, per_page, cache_key=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        return CachedCountPaginator(
+            self.queryset, self.per_page, cache_key=self.cache_key).count
+
+    @property
+    def ordering(self):
+        sign = "-" if self.descending else ""
+        return (f"{sign}{self.key_field}", f"{sign}pk")
+
+    def encode_cursor(self, obj, reverse=False):
+        return encode_cursor(obj, reverse, key_field=self.key_field)
+
+    def get_page_queryset(self, cursor=None):
+        """Вернуть ``(reverse, queryset)`` для страницы после курсора."""
+        queryset = self.queryset.order_by(*self.ordering)
+        if not cursor:
+            return False, queryset
+        reverse, key, pk = decode_cursor(cursor)
+        lookup = "lt" if self.descending != reverse else "gt"
+        field = self.key_field
+        # Избыточное условие на один ключ даёт БД границу диапазона
+        # в индексе: по одному OR она его не найдёт.
+        queryset = queryset.filter(
+            Q(**{f"{field}__{lookup}": key})
+            | Q(**{field: key, f"pk__{lookup}": pk}),
+            **{f"{field}__{lookup}e": key},
+        )
+        return reverse, queryset.reverse() if reverse else queryset
+
+    def page(self, cursor=None):
+        reverse, queryset = self.get_page_queryset(cursor)
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = self.encode_cursor(object_list[-1])
+        if object_list and has_previous:
+            previous_cursor = self.encode_cursor(object_list[0], reverse=True)
+        return CursorPage(object_list, self, next_cursor, previous_cursor)
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Комментарии от старых к новым по ключу ``(created_at, id)``."""
+
+    key_field = "created_at"
+    descending = False
@@ -0,0 +1,69 @@
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Наибольшая ширина каждого варианта; меньшие изображения не растягиваются.
+RENDITION_WIDTHS = {
+    "card": 640,
+    "detail": 1280,
+}
+# Расширение файла -> (формат Pillow, параметры сохранения).
+RENDITION_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+RENDITIONS_DIR = "post_images/renditions"
+
+
+def rendition_name(image_name, rendition, extension):
+    stem = posixpath.splitext(posixpath.basename(image_name))[0]
+    return f"{RENDITIONS_DIR}/{stem}_{rendition}.{extension}"
+
+
+def render_renditions(image_name, storage=default_storage):
+    """Сохранить уменьшенные копии изображения и вернуть их описание.
+
+    Результат — словарь вида ``{"card": {"width": …, "height": …,
+    "webp": путь, "jpeg": путь}, …}``: его хранит ``Post.image_renditions``,
+    а размеры попадают в атрибуты ``<img>``, чтобы не было сдвига вёрстки.
+    Функция не обращается к БД и годится для запуска в пуле процессов.
+    """
+    with storage.open(image_name) as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image = image.convert("RGB")
+    renditions = {}
+    for rendition, max_width in RENDITION_WIDTHS.items():
+        resized = image.copy()
+        resized.thumbnail(
+            (max_width, max_width * 10), Image.Resampling.LANCZOS)
+        renditions[rendition] = {
+            "width": resized.width,
+            "height": resized.height,
+        }
+        for extension, (pil_format, options) in RENDITION_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = rendition_name(image_name, rendition, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            renditions[rendition][extension] = storage.save(
+                name, ContentFile(buffer.getvalue()))
+    return renditions
+
+
+def delete_renditions(renditions, storage=default_storage):
+    for rendition in renditions.values():
+        for extension in RENDITION_FORMATS:
+            if rendition.get(extension):
+                storage.delete(rendition[extension])
+
+
+def sync_renditions(post):
+    """Пересоздать варианты изображения публикации после его смены."""
+    delete_renditions(post.image_renditions)
+    post.image_renditions = (
+        render_renditions(post.image.name) if post.image else {})
+    post.save(update_fields=["image_renditions"])
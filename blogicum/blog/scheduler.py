@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import const
+from .cache import bump_feed_version
+from .models import Post
+
+# Отправляется после перевода отложенных публикаций в ленту;
+# аргумент post_ids — список первичных ключей.
+posts_published = Signal()
+
+TICK_KEY = "blog:scheduler:tick"
+
+
+def publish_due_posts(now=None):
+    """Перевести наступившие отложенные публикации в статус published.
+
+    Все публикации переводятся одним UPDATE; возвращает их число.
+    """
+    due = Post.objects.filter(
+        status="scheduled", pub_date__lte=now or timezone.now())
+    with transaction.atomic():
+        post_ids = list(due.values_list("pk", flat=True))
+        if not post_ids:
+            return 0
+        due_posts = Post.objects.filter(pk__in=post_ids)
+        due_posts.update(status="published")
+        due_posts.sync_visibility()
+    bump_feed_version()
+    posts_published.send(sender=Post, post_ids=post_ids)
+    return len(post_ids)
+
+
+def tick():
+    """Запустить publish_due_posts(), если с прошлого запуска прошёл интервал.
+
+    Первый процесс, успевший занять ключ в кэше, выполняет перевод,
+    остальные до истечения интервала ничего не делают.
+    """
+    if cache.add(TICK_KEY, True, const.SCHEDULER_INTERVAL):
+        return publish_due_posts()
+    return 0
@@ -0,0 +1,172 @@
+"""Полнотекстовый поиск по публикациям.
+
+Движок подключается настройкой ``BLOG_SEARCH_BACKEND``. По умолчанию это
+FTS5 в SQLite; ``PostgresSearchBackend`` даёт то же самое на ``tsvector``.
+У FTS5 нет русского стеммера, поэтому в индекс и в запрос попадают уже
+обработанные ``stem_words()`` основы слов.
+"""
+import logging
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+WORD_RE = re.compile(r"\w+")
+STEM_CACHE_SIZE = 100_000
+
+logger = logging.getLogger("blog.search")
+
+
+@lru_cache(maxsize=None)
+def get_stemmer():
+    if snowballstemmer is None:
+        logger.warning(
+            "snowballstemmer не установлен: поиск работает без русского "
+            "стеммера и находит только точные формы слов."
+        )
+        return None
+    return snowballstemmer.stemmer("russian")
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem_word(word):
+    # Стеммер написан на чистом Python, а словарь текстов невелик:
+    # без кэша массовая индексация упирается в него.
+    return get_stemmer().stemWord(word)
+
+
+def stem_words(text):
+    """Основы слов текста; без snowballstemmer — просто слова."""
+    words = WORD_RE.findall(text.lower().replace("ё", "е"))
+    if get_stemmer() is None:
+        return words
+    return [stem_word(word) for word in words]
+
+
+class SearchBackend:
+    """Интерфейс движка поиска.
+
+    ``index()`` и ``remove()`` вызываются из сигналов и команды
+    ``reindex_search``; ``search()`` сужает уже отфильтрованный по
+    видимости queryset до подходящих публикаций, лучшие — первыми.
+    """
+
+    def index(self, posts):
+        raise NotImplementedError
+
+    def remove(self, pks):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class SqliteFtsBackend(SearchBackend):
+    table = "blog_post_fts"
+    # Совпадение в заголовке весит больше, чем в тексте.
+    rank = f"bm25({table}, 10.0, 1.0)"
+
+    def index(self, posts):
+        rows = [
+            (post.pk, " ".join(stem_words(post.title)),
+             " ".join(stem_words(post.text)))
+            for post in posts
+        ]
+        if not rows:
+            return
+        self.remove([pk for pk, _, _ in rows])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN "
+                f"({', '.join(['%s'] * len(pks))})",
+                pks,
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def search(self, queryset, query):
+        terms = stem_words(query)
+        if not terms:
+            return queryset.none()
+        # Префиксный поиск: «публ» находит и «публикац».
+        match = " ".join(f'"{term}"*' for term in terms)
+        matched = f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s"
+        # Ранг нужен только найденным строкам; FTS5 ищет их по rowid.
+        rank = (
+            f"SELECT {self.rank} FROM {self.table} WHERE {self.table} "
+            f"MATCH %s AND rowid = {queryset.model._meta.db_table}.id"
+        )
+        return (
+            queryset.filter(pk__in=RawSQL(matched, (match,)))
+            .annotate(search_rank=RawSQL(rank, (match,)))
+            .order_by("search_rank", "-pub_date", "-pk")
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Поиск на ``tsvector`` со словарём ``russian``.
+
+    Вектор считается выражением, поэтому отдельная таблица не нужна и
+    синхронизировать нечего; для скорости достаточно GIN-индекса по тому
+    же выражению.
+    """
+
+    config = "russian"
+
+    def index(self, posts):
+        pass
+
+    def remove(self, pks):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = (
+            SearchVector("title", weight="A", config=self.config)
+            + SearchVector("text", weight="B", config=self.config)
+        )
+        search_query = SearchQuery(query, config=self.config)
+        return (
+            queryset.annotate(search_vector=vector)
+            .filter(search_vector=search_query)
+            .annotate(search_rank=SearchRank(F("search_vector"), search_query))
+            .order_by(F("search_rank").desc(), "-pub_date", "-pk")
+        )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    return import_string(settings.BLOG_SEARCH_BACKEND)()
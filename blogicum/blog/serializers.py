@@ -0,0 +1,54 @@
+"""Компактное JSON-представление публикаций и комментариев.
+
+Рядом с каждым ``serialize_*`` лежит ``*_version``: кортеж полей, от
+которых зависит результат. По нему API считает ETag, не собирая ответ.
+"""
+from django.urls import reverse
+
+
+def serialize_post(post, full=False):
+    location = post.location
+    data = {
+        "id": post.pk,
+        "url": reverse("blog:post_detail", args=(post.pk,)),
+        "title": post.title,
+        "excerpt": post.excerpt,
+        "pub_date": post.pub_date.isoformat(),
+        "author": post.author.username,
+        "category": post.category and {
+            "slug": post.category.slug,
+            "title": post.category.title,
+        },
+        "location": (
+            location.name if location and location.is_published else None),
+        "image": post.image.url if post.image else None,
+        "comment_count": post.comment_count,
+    }
+    if full:
+        data["text"] = post.text
+    return data
+
+
+def post_version(post):
+    category, location = post.category, post.location
+    return (
+        post.pk,
+        post.updated_at.isoformat(),
+        post.comment_count,
+        post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+    )
+
+
+def serialize_comment(comment):
+    return {
+        "id": comment.pk,
+        "author": comment.author.username,
+        "text": comment.text,
+        "created_at": comment.created_at.isoformat(),
+    }
+
+
+def comment_version(comment):
+    return comment.pk, comment.author.username, comment.text
@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import snapshots
+from .cache import bump_feed_version
+from .models import Category, Comment, Location, Post
+from .scheduler import posts_published
+from .search import get_search_backend
+
+User = get_user_model()
+
+# Пока идёт массовое удаление из админки, приёмники удаления ниже ничего не
+# делают: кэш лент, снимки и поисковый индекс админка поправляет один раз
+# на всё выделение (см. BulkModerationMixin.delete_queryset()).
+bulk_deletion_active = ContextVar("blog_bulk_deletion", default=False)
+
+
+@contextmanager
+def bulk_deletion():
+    token = bulk_deletion_active.set(True)
+    try:
+        yield
+    finally:
+        bulk_deletion_active.reset(token)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feeds(sender, **kwargs):
+    if not bulk_deletion_active.get():
+        bump_feed_version()
+
+
+# Поля пользователя, которые выводятся в карточках, шапке профиля и на
+# странице публикации.
+USER_FEED_FIELDS = {"username", "first_name", "last_name", "is_staff"}
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, update_fields=None, **kwargs):
+    # Вход сохраняет только last_login — ради него кэш не сбрасываем.
+    if not update_fields or USER_FEED_FIELDS & set(update_fields):
+        bump_feed_version()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {"title", "text"} & set(update_fields):
+        return
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    if not bulk_deletion_active.get():
+        get_search_backend().remove([instance.pk])
+
+
+# Поля, от которых зависят место публикации в лентах и её видимость.
+FEED_FIELDS = {"pub_date", "status", "is_published", "category"}
+
+
+def touches_feeds(update_fields):
+    return not update_fields or bool(FEED_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=Post)
+def remember_feed_category(sender, instance, update_fields=None, **kwargs):
+    # Из снимка старой категории публикацию нужно будет убрать.
+    if instance.pk is None or not touches_feeds(update_fields):
+        return
+    instance._feed_category_id = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("category_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def place_post_in_feeds(sender, instance, update_fields=None, **kwargs):
+    if not touches_feeds(update_fields):
+        return
+    snapshots.place_posts(
+        [instance.pk], [getattr(instance, "_feed_category_id", None)])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_feeds(sender, instance, **kwargs):
+    if not bulk_deletion_active.get():
+        snapshots.remove_post(instance.pk, instance.category_id)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_visibility(sender, instance, **kwargs):
+    instance._was_published = (
+        instance.pk is not None and Category.objects.filter(
+            pk=instance.pk, is_published=True).exists()
+    )
+
+
+@receiver(post_save, sender=Category)
+def sync_posts_visibility(sender, instance, created, **kwargs):
+    # Идёт раньше снимков лент: те строятся по is_visible.
+    if not created and instance.is_published != getattr(
+            instance, "_was_published", None):
+        instance.posts.sync_visibility()
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    # SET_NULL обнуляет категорию через UPDATE, без save() публикаций.
+    if not bulk_deletion_active.get():
+        instance.posts.update(is_visible=False)
+
+
+@receiver(post_save, sender=Category)
+def place_category_in_feeds(sender, instance, **kwargs):
+    snapshots.place_category(instance)
+
+
+@receiver(post_delete, sender=Category)
+def reset_feeds(sender, **kwargs):
+    # Публикации удалённой категории теряют её через UPDATE, без сигналов.
+    if not bulk_deletion_active.get():
+        snapshots.invalidate_snapshots()
+
+
+@receiver(posts_published)
+def place_published_posts(sender, post_ids, **kwargs):
+    snapshots.place_posts(post_ids)
@@ -0,0 +1,220 @@
+"""Снимки лент: упорядоченные ключи видимых публикаций в кэше.
+
+Главная лента и лента категории одинаковы для всех посетителей, поэтому
+порядок публикаций в них хранится готовым списком, и страница сводится
+к срезу ключей и ``in_bulk()`` по первичному ключу. Снимок держит не
+больше ``const.FEED_SNAPSHOT_SIZE`` первых публикаций — дальние страницы
+по-прежнему читаются из БД.
+
+Публикация, снятие с публикации, перенос между категориями и переключение
+категории правят снимки на месте, а недостающий снимок при этом строится
+сразу — страница ленты не платит за сборку после каждой записи. Массовые
+изменения вместо этого вызывают ``invalidate_snapshots()``, и снимки
+строятся заново при следующем показе. Остальные гонки (например,
+одновременная сборка и правка снимка) исправляет срок жизни ключа.
+
+Снимки лежат в общем для процессов кэше (по умолчанию файловом), поэтому
+правки команд и фоновых процессов сразу видны процессам сервера. С
+кэшем в памяти процесса (``LocMemCache``) чужие процессы узнали бы об
+изменении только по истечении срока жизни ключа — поэтому он такой же,
+как у кэша страниц.
+"""
+import time
+from bisect import insort
+
+from django.core.cache import cache
+
+from . import const
+from .models import Post
+
+GLOBAL_FEED = "all"
+GENERATION_KEY = "blog:snapshot:generation"
+
+
+def category_feed(category_id):
+    return f"category:{category_id}"
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Как и версия лент (blog.cache), поколение начинается со времени:
+        # если ключ вытеснили, старые снимки ещё живы и не должны вернуться.
+        generation = time.time_ns()
+        cache.add(GENERATION_KEY, generation, None)
+        generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def invalidate_snapshots():
+    """Сбросить все снимки разом: ключи получают новое поколение."""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        get_generation()
+
+
+def snapshot_key(feed):
+    return f"blog:snapshot:{get_generation()}:{feed}"
+
+
+def sort_key(pk, pub_date):
+    # По возрастанию этого ключа — новые публикации первыми, как в ленте.
+    return (-pub_date.timestamp(), -pk)
+
+
+def feed_queryset(feed):
+    queryset = Post.objects.published()
+    if feed != GLOBAL_FEED:
+        queryset = queryset.filter(category_id=int(feed.split(":")[1]))
+    return queryset
+
+
+class FeedSnapshot:
+    def __init__(self, entries, complete):
+        # Пары sort_key(); complete — в снимке вся лента, а не её начало.
+        self.entries = entries
+        self.complete = complete
+
+    @classmethod
+    def build(cls, feed):
+        rows = (
+            feed_queryset(feed).order_by("-pub_date", "-pk")
+            .values_list("pk", "pub_date")[:const.FEED_SNAPSHOT_SIZE + 1]
+        )
+        entries = [sort_key(pk, pub_date) for pk, pub_date in rows]
+        complete = len(entries) <= const.FEED_SNAPSHOT_SIZE
+        return cls(entries[:const.FEED_SNAPSHOT_SIZE], complete)
+
+    @property
+    def ids(self):
+        return [-pk for _, pk in self.entries]
+
+    def remove(self, pks):
+        pks = {-pk for pk in pks}
+        self.entries = [entry for entry in self.entries if entry[1] not in pks]
+
+    def insert(self, entry):
+        if not self.complete and self.entries and entry > self.entries[-1]:
+            # Публикация дальше окна снимка — её покажет запрос к БД.
+            return
+        insort(self.entries, entry)
+        if len(self.entries) > const.FEED_SNAPSHOT_SIZE:
+            self.entries.pop()
+            self.complete = False
+
+    def merge(self, other):
+        self.remove([-pk for _, pk in other.entries])
+        for entry in other.entries:
+            self.insert(entry)
+        self.complete = self.complete and other.complete
+
+
+def get_snapshot(feed):
+    key = snapshot_key(feed)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = FeedSnapshot.build(feed)
+        cache.add(key, snapshot, const.FEED_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def update_snapshot(feed, change):
+    """Применить ``change(snapshot)`` к снимку в кэше, построив его заново.
+
+    Правку, которую не удалось сделать под блокировкой, заменяет сброс
+    снимка: он соберётся заново при следующем показе.
+    """
+    key = snapshot_key(feed)
+    lock = f"{key}:lock"
+    if not cache.add(lock, True, const.FEED_SNAPSHOT_LOCK_TIMEOUT):
+        cache.delete(key)
+        return
+    try:
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = FeedSnapshot.build(feed)
+        change(snapshot)
+        cache.set(key, snapshot, const.FEED_SNAPSHOT_TIMEOUT)
+    finally:
+        cache.delete(lock)
+
+
+def place_posts(post_ids, old_category_ids=()):
+    """Убрать публикации из снимков и вставить туда, где они видны."""
+    rows = {
+        pk: (pub_date, category_id)
+        for pk, pub_date, category_id in Post.objects.published()
+        .filter(pk__in=post_ids)
+        .values_list("pk", "pub_date", "category_id")
+    }
+    feeds = {GLOBAL_FEED}
+    feeds.update(category_feed(pk) for pk in old_category_ids if pk)
+    feeds.update(category_feed(row[1]) for row in rows.values())
+
+    def change(feed):
+        def apply(snapshot):
+            snapshot.remove(post_ids)
+            for pk, (pub_date, category_id) in rows.items():
+                if feed in (GLOBAL_FEED, category_feed(category_id)):
+                    snapshot.insert(sort_key(pk, pub_date))
+        return apply
+
+    for feed in feeds:
+        update_snapshot(feed, change(feed))
+
+
+def remove_post(pk, category_id):
+    for feed in (GLOBAL_FEED, category_feed(category_id)):
+        update_snapshot(feed, lambda snapshot: snapshot.remove([pk]))
+
+
+def place_category(category):
+    """Влить публикации категории в общий снимок или убрать их оттуда."""
+    cache.delete(snapshot_key(category_feed(category.pk)))
+    if category.is_published:
+        update_snapshot(GLOBAL_FEED, lambda snapshot: snapshot.merge(
+            FeedSnapshot.build(category_feed(category.pk))))
+        return
+
+    def remove(snapshot):
+        snapshot.remove(Post.objects.filter(
+            category=category, pk__in=snapshot.ids
+        ).values_list("pk", flat=True))
+
+    update_snapshot(GLOBAL_FEED, remove)
+
+
+class SnapshotPostList:
+    """Лента для ``Paginator``: срезы — из снимка, строки — ``in_bulk()``.
+
+    Видимость ещё раз проверяет сам ``queryset``, так что устаревший
+    снимок может лишь недодать публикацию на странице, но не показать
+    скрытую.
+    """
+
+    ordered = True
+
+    def __init__(self, feed, queryset):
+        self.feed = feed
+        self.queryset = queryset
+        self.snapshot = get_snapshot(feed)
+
+    def count(self):
+        if self.snapshot.complete:
+            return len(self.snapshot.entries)
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        if not self.snapshot.complete and (
+                stop is None or stop > len(self.snapshot.entries)):
+            return list(self.queryset[index])
+        ids = self.snapshot.ids[start:stop]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
@@ -0,0 +1,30 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from blog.renditions import RENDITION_FORMATS
+
+register = template.Library()
+
+
+@register.inclusion_tag("includes/post_picture.html")
+def post_picture(post, rendition):
+    """Картинка публикации с ``srcset`` из готовых уменьшенных копий.
+
+    Пока копий нет или они ещё готовятся в очереди, выводится исходный файл.
+    """
+    renditions = post.image_renditions
+    context = {"post": post, "source": None, "sources": []}
+    if (not post.image or post.image_status != post.IMAGE_READY
+            or rendition not in renditions):
+        return context
+    for extension in RENDITION_FORMATS:
+        srcset = ", ".join(
+            f"{default_storage.url(variant[extension])} {variant['width']}w"
+            for variant in renditions.values()
+        )
+        context["sources"].append((f"image/{extension}", srcset))
+    context["source"] = dict(
+        renditions[rendition],
+        url=default_storage.url(renditions[rendition]["jpeg"]),
+    )
+    return context
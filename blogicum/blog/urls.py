@@ -1,8 +1,18 @@
+from django.conf import settings
 from django.urls import include, path
 
+from .api import (
+    CategoryPostListApiView,
+    CommentListApiView,
+    PostDetailApiView,
+    PostListApiView,
+    ProfileApiView,
+)
+from .metrics import metrics_view
 from .views import (
     AddCommentView,
     CategoryPostListView,
+    CommentListView,
     CreatePostView,
     DeleteCommentView,
     DeletePostView,
@@ -12,13 +22,25 @@ from .views import (
     PostDetailView,
     PostListView,
     ProfileView,
+    SearchView,
 )
 
+# Под ASGI страницы для чтения отдаются асинхронными, см. blog.async_views.
+if settings.BLOG_ASYNC_VIEWS:
+    from .async_views import category_posts, post_detail, post_list, profile
+else:
+    post_list = PostListView.as_view()
+    category_posts = CategoryPostListView.as_view()
+    post_detail = PostDetailView.as_view()
+    profile = ProfileView.as_view()
+
 app_name = "blog"
 
 posts_urls = [
-    path("<int:post_id>/", PostDetailView.as_view(), name="post_detail"),
+    path("<int:post_id>/", post_detail, name="post_detail"),
     path("create/", CreatePostView.as_view(), name="create_post"),
+    path("<int:post_id>/comments/",
+         CommentListView.as_view(), name="comments"),
     path("<int:post_id>/comment/add/",
          AddCommentView.as_view(), name="add_comment"),
     path(
@@ -38,16 +60,30 @@ posts_urls = [
 
 
 category_urls = [
+    path("<slug:category_slug>/", category_posts, name="category_posts"),
+]
+
+api_urls = [
+    path("posts/", PostListApiView.as_view(), name="api_index"),
+    path("posts/<int:post_id>/",
+         PostDetailApiView.as_view(), name="api_post_detail"),
+    path("posts/<int:post_id>/comments/",
+         CommentListApiView.as_view(), name="api_comments"),
     path(
-        "<slug:category_slug>/",
-        CategoryPostListView.as_view(), name="category_posts"
+        "category/<slug:category_slug>/",
+        CategoryPostListApiView.as_view(), name="api_category_posts"
     ),
+    path("profile/<str:username>/",
+         ProfileApiView.as_view(), name="api_profile"),
 ]
 
 urlpatterns = [
-    path("", PostListView.as_view(), name="index"),
+    path("", post_list, name="index"),
     path("posts/", include(posts_urls)),
     path("category/", include(category_urls)),
-    path("profile/<str:username>/", ProfileView.as_view(), name="profile"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("profile/<str:username>/", profile, name="profile"),
     path("edit_profile/", EditProfileView.as_view(), name="edit_profile"),
+    path("api/", include(api_urls)),
+    path("metrics/", metrics_view, name="metrics"),
 ]
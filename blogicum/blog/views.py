@@ -1,11 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count, Q
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.http import urlencode
 from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 from django.views import View
 from django.views.generic import (
     CreateView,
@@ -15,67 +17,122 @@ from django.views.generic import (
     UpdateView,
 )
 
+from . import snapshots
 from .forms import CommentForm, EditProfileForm, PostForm
-from .mixins import PostListMixin
+from .jobs import schedule_renditions
+from .mixins import (
+    AnonymousPageCacheMixin,
+    CommentPageMixin,
+    ConditionalPageMixin,
+    MemoizedObjectMixin,
+    PostListMixin,
+    PublishDueMixin,
+)
 from .models import Category, Comment, Post
+from .search import get_search_backend
+from .serializers import serialize_comment
 
 User = get_user_model()
 
 
-class PostListView(PostListMixin, ListView):
+class PostListView(PublishDueMixin, AnonymousPageCacheMixin,
+                   ConditionalPageMixin, PostListMixin, ListView):
     template_name = "blog/index.html"
 
+    def get_snapshot_feed(self):
+        return snapshots.GLOBAL_FEED
+
 
-class PostDetailView(DetailView):
+class PostDetailView(PublishDueMixin, AnonymousPageCacheMixin,
+                     ConditionalPageMixin, MemoizedObjectMixin,
+                     CommentPageMixin, DetailView):
     model = Post
     template_name = "blog/detail.html"
 
-    def get_object(self, **kwargs):
-        queryset = Post.objects.all()
-        if not self.request.user.is_authenticated:
-            queryset = queryset.filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now(),
-            )
-        else:
-            queryset = queryset.filter(
-                Q(author__username=self.request.user.username)
-                | (
-                    Q(is_published=True)
-                    & Q(category__is_published=True)
-                    & Q(pub_date__lte=timezone.now())
-                )
-            )
-        post = get_object_or_404(queryset, pk=self.kwargs["post_id"])
-        if post.status == "scheduled" and post.author != self.request.user:
-            return redirect("pages:error_404")
-        return post
+    def get_queryset(self):
+        return Post.objects.select_related(
+            "author", "category", "location"
+        ).visible_to(self.request.user)
+
+    def lookup_object(self, queryset=None):
+        return get_object_or_404(self.get_queryset(),
+                                 pk=self.kwargs["post_id"])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["comments"] = Comment.objects.filter(
-            post_id=self.kwargs["post_id"], is_published=True
-        ).select_related("author")
+        context["comments"] = self.get_comments_page(self.object.pk)
         context["form"] = CommentForm()
         return context
 
 
-class CategoryPostListView(PostListMixin, ListView):
+class CommentListView(AnonymousPageCacheMixin, CommentPageMixin, View):
+    """Следующая порция комментариев для кнопки «Показать ещё».
+
+    Отдаёт HTML-фрагмент, а с ``?format=json`` — те же данные в JSON.
+    """
+
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.visible_to(request.user).only("pk"), pk=post_id)
+        page = self.get_comments_page(post.pk, request.GET.get("cursor"))
+        return self.render_to_response(post, page)
+
+    def render_to_response(self, post, page):
+        if self.request.GET.get("format") == "json":
+            return JsonResponse({
+                "results": [serialize_comment(comment) for comment in page],
+                "next_cursor": page.next_cursor,
+            })
+        return render(self.request, "includes/comment_list.html",
+                      {"post": post, "comments": page})
+
+
+class CategoryPostListView(PublishDueMixin, AnonymousPageCacheMixin,
+                           ConditionalPageMixin, MemoizedObjectMixin,
+                           PostListMixin, ListView):
     template_name = "blog/category.html"
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        category = get_object_or_404(
+    def lookup_object(self, queryset=None):
+        return get_object_or_404(
             Category, slug=self.kwargs["category_slug"], is_published=True
         )
-        return queryset.filter(category=category)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(category=self.get_object())
+
+    def get_snapshot_feed(self):
+        return snapshots.category_feed(self.get_object().pk)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["category"] = get_object_or_404(
-            Category, slug=self.kwargs["category_slug"]
-        )
+        context["category"] = self.get_object()
+        return context
+
+
+class SearchView(PublishDueMixin, AnonymousPageCacheMixin, PostListMixin,
+                 ListView):
+    """Поиск по заголовкам и текстам в пределах видимых в ленте записей."""
+
+    template_name = "blog/search.html"
+    # Результаты идут по релевантности, а не по дате — курсор не подходит.
+    cursor_pagination = False
+
+    @property
+    def query(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_queryset(self):
+        if not self.query:
+            return Post.objects.none()
+        return get_search_backend().search(super().get_queryset(), self.query)
+
+    def get_count_cache_key(self):
+        return f"{super().get_count_cache_key()}:q={self.query}"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        context["page_query"] = urlencode({"q": self.query}) + "&"
         return context
 
 
@@ -87,40 +144,44 @@ class CreatePostView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         post = form.save(commit=False)
         post.author = self.request.user
-        if post.pub_date <= timezone.now():
-            post.status = "published"
-        else:
-            post.status = "scheduled"
         post.save()
+        if post.image:
+            schedule_renditions(post)
         return redirect("blog:profile", username=self.request.user.username)
 
 
-class EditPostView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class EditPostView(LoginRequiredMixin, UserPassesTestMixin,
+                   MemoizedObjectMixin, UpdateView):
     model = Post
     form_class = PostForm
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
 
     def test_func(self):
-        post = self.get_object()
-        return post.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if "image" in form.changed_data:
+            schedule_renditions(self.object)
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         return context
 
 
-class DeletePostView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeletePostView(LoginRequiredMixin, UserPassesTestMixin,
+                     MemoizedObjectMixin, DeleteView):
     model = Post
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
 
     def test_func(self):
-        post = get_object_or_404(Post, id=self.kwargs["post_id"])
-        return post.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
@@ -131,33 +192,33 @@ class DeletePostView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        context["form"] = self.get_form(instance=post)
+        context["form"] = PostForm(instance=self.object)
         return context
 
 
-class ProfileView(PostListMixin, ListView):
+class ProfileView(PublishDueMixin, AnonymousPageCacheMixin,
+                  MemoizedObjectMixin, PostListMixin, ListView):
     template_name = "blog/profile.html"
 
-    def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs["username"])
-        if self.request.user == user:
-            return (
-                Post.objects.filter(author=user)
-                .annotate(
-                    comment_count=Count(
-                        "comments", filter=Q(comments__is_published=True)
-                    )
-                )
-                .order_by("-pub_date")
-                .select_related()
-            )
-        return super().get_queryset().filter(author=user)
+    def lookup_object(self, queryset=None):
+        return get_object_or_404(User, username=self.kwargs["username"])
+
+    def get_posts(self):
+        return Post.objects.authored_by(self.get_object(), self.request.user)
+
+    def get_count_cache_key(self):
+        key = super().get_count_cache_key()
+        if self.request.user.username == self.kwargs["username"]:
+            return key + ":owner"
+        return key
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = get_object_or_404(User, username=self.kwargs["username"])
-        context["profile"] = user
+        profile = self.get_object()
+        context["profile"] = profile
+        # Считается, только если шапки профиля нет в кэше фрагментов.
+        context["profile_stats"] = SimpleLazyObject(
+            lambda: Post.objects.author_stats(profile))
         return context
 
 
@@ -185,9 +246,12 @@ class AddCommentView(LoginRequiredMixin, CreateView):
         comment = form.save(commit=False)
         comment.post = post
         comment.author = self.request.user
-        comment.save()
-
-        return super().form_valid(form)
+        with transaction.atomic():
+            comment.save()
+            if comment.is_published:
+                Post.objects.filter(pk=post.pk).shift_comment_count(1)
+        self.object = comment
+        return redirect(self.get_success_url())
 
     def get_success_url(self):
         return reverse("blog:post_detail",
@@ -195,6 +259,12 @@ class AddCommentView(LoginRequiredMixin, CreateView):
 
 
 class EditCommentView(LoginRequiredMixin, UpdateView):
+    """Правка своего комментария.
+
+    В форме только текст, так что число опубликованных комментариев не
+    меняется и счётчик публикации пересчитывать не нужно.
+    """
+
     model = Comment
     form_class = CommentForm
     template_name = "blog/create.html"
@@ -227,3 +297,11 @@ class DeleteCommentView(LoginRequiredMixin, DeleteView):
     def get_success_url(self):
         return reverse("blog:post_detail",
                        kwargs={"post_id": self.kwargs["post_id"]})
+
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            if self.object.is_published:
+                Post.objects.filter(
+                    pk=self.object.post_id).shift_comment_count(-1)
+        return response
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -43,17 +44,26 @@ ROOT_URLCONF = "blogicum.urls"
 
 TEMPLATES_DIR = BASE_DIR / "templates"
 
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "blog.metrics.MetricsTemplates",
         "DIRS": [TEMPLATES_DIR],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Без DEBUG шаблоны разбираются один раз на процесс.
+            "loaders": TEMPLATE_LOADERS if DEBUG else [
+                ("django.template.loaders.cached.Loader", TEMPLATE_LOADERS),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "blog.context_processors.feed_cache",
             ],
         },
     },
@@ -68,6 +78,21 @@ DATABASES = {
     }
 }
 
+# Кэш общий для всех процессов: версию лент, по которой строятся ETag и
+# ключи страниц, меняют не только процессы сервера, но и команды
+# (publish_scheduled --loop, загрузка и генерация данных). Изменения в
+# LocMemCache остались бы внутри процесса, который их сделал. Для
+# нескольких машин нужен сетевой кэш (Redis, Memcached).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "BLOGICUM_CACHE_DIR", str(BASE_DIR / "cache")
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -110,3 +135,17 @@ LOGIN_URL = "login"
 MEDIA_URL = "/media/"
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+BLOG_CURSOR_PAGINATION = False
+
+# Перевод отложенных публикаций прямо из GET-запросов — только для
+# разработки. В бою их переводит `manage.py publish_scheduled --loop`.
+BLOG_INLINE_SCHEDULER = DEBUG
+
+BLOG_SEARCH_BACKEND = "blog.search.SqliteFtsBackend"
+
+BLOG_SLOW_REQUEST_MS = 500
+
+# Асинхронные страницы для чтения (blog.async_views) для запуска под ASGI.
+# Под WSGI каждая из них обходилась бы лишним циклом событий на запрос.
+BLOG_ASYNC_VIEWS = os.environ.get("BLOGICUM_ASYNC_VIEWS") == "1"
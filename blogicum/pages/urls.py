@@ -1,13 +1,21 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
     AboutView, Error403View, Error404View, Error500View, RulesView)
 
+if settings.BLOG_ASYNC_VIEWS:
+    from blog.async_views import async_view
+
+    about, rules = async_view(AboutView), async_view(RulesView)
+else:
+    about, rules = AboutView.as_view(), RulesView.as_view()
+
 app_name = "pages"
 
 urlpatterns = [
-    path("about/", AboutView.as_view(), name="about"),
-    path("rules/", RulesView.as_view(), name="rules"),
+    path("about/", about, name="about"),
+    path("rules/", rules, name="rules"),
     path("404/", Error404View.as_view(), name="error_404"),
     path("500/", Error500View.as_view(), name="error_500"),
     path("403/", Error403View.as_view(), name="403csrf"),
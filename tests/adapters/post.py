@@ -33,6 +33,7 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "image_status",
             "refresh_from_db",
         ]
 
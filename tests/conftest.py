@@ -18,7 +18,9 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +43,28 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    # Файловый кэш тестов — во временном каталоге, а не в кэше сервера.
+    default = {
+        **settings.CACHES["default"],
+        "LOCATION": str(tmp_path_factory.mktemp("cache")),
+    }
+    with override_settings(CACHES={"default": default}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(cache_dir):
+    caches["default"].clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=str(tmp_path / "media")):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -362,7 +386,9 @@ def cleanup(request):
             if (
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
+                    or filename.endswith(".jpeg")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
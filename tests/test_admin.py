@@ -0,0 +1,148 @@
+import pytest
+
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import Permission
+
+from blog import snapshots
+from blog.cache import get_feed_version
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Сессия, пользователь, категории для фильтра, COUNT, строки,
+    # границы дат, ступень date_hierarchy и категории для действий.
+    ("/admin/blog/post/", 8),
+    # Без фильтра по категориям.
+    ("/admin/blog/comment/", 6),
+    # Плюс заголовок выбранной публикации в фильтре.
+    ("/admin/blog/comment/?post={post}", 7),
+])
+@pytest.mark.parametrize("rows", [1, 15])
+def test_changelist_queries(
+        admin_client, django_assert_num_queries, mixer, user, url,
+        expected, rows):
+    post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(rows).blend("blog.Post", author=user)
+    mixer.cycle(rows).blend("blog.Comment", post=post, author=user)
+    with django_assert_num_queries(expected):
+        response = admin_client.get(url.format(post=post.pk))
+    assert response.status_code == 200
+    assert len(response.context["cl"].result_list) > 0
+
+
+def test_comment_post_filter(admin_client, mixer, user):
+    post, other = mixer.cycle(2).blend("blog.Post", author=user)
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    mixer.blend("blog.Comment", post=other, author=user)
+    response = admin_client.get(f"/admin/blog/comment/?post={post.pk}")
+    assert list(response.context["cl"].result_list) == [comment], (
+        "Убедитесь, что фильтр по публикации в админке комментариев"
+        " оставляет только комментарии выбранной публикации."
+    )
+
+
+def run_action(admin_client, url, action, selected, **data):
+    return admin_client.post(url, {
+        "action": action,
+        "_selected_action": [obj.pk for obj in selected],
+        "index": 0,
+        **data,
+    })
+
+
+def test_publish_across_pages(admin_client, mixer, user):
+    posts = mixer.cycle(3).blend("blog.Post", author=user, is_published=False)
+    response = run_action(
+        admin_client, "/admin/blog/post/?is_published__exact=0",
+        "publish_selected", posts[:1], select_across=1)
+    assert response.status_code == 302
+    assert not Post.objects.filter(is_published=False).exists(), (
+        "Убедитесь, что действие «Опубликовать выбранные» с выбором всех"
+        " записей публикует всю отфильтрованную выборку."
+    )
+
+
+def test_bulk_actions_are_set_based(
+        admin_client, django_assert_max_num_queries, mixer, user):
+    posts = mixer.cycle(20).blend("blog.Post", author=user)
+    comments = mixer.cycle(20).blend(
+        "blog.Comment", post=posts[0], author=user, is_published=True)
+    # Число запросов не зависит от числа выбранных строк.
+    with django_assert_max_num_queries(8):
+        run_action(admin_client, "/admin/blog/comment/",
+                   "unpublish_selected", comments)
+    posts[0].refresh_from_db()
+    assert posts[0].comment_count == 0, (
+        "Убедитесь, что после массового снятия комментариев с публикации"
+        " счётчики комментариев пересчитываются."
+    )
+    run_action(admin_client, "/admin/blog/post/", "delete_selected", posts,
+               post="yes")
+    assert not Post.objects.exists() and not Comment.objects.exists()
+
+
+def test_recategorize(admin_client, mixer, user, published_category):
+    post = mixer.blend("blog.Post", author=user, category=None)
+    version = get_feed_version()
+    run_action(admin_client, "/admin/blog/post/", "recategorize_selected",
+               [post], category=published_category.pk)
+    post.refresh_from_db()
+    assert post.category == published_category
+    assert get_feed_version() != version, (
+        "Убедитесь, что массовые действия в админке сбрасывают кэш лент."
+    )
+
+
+def test_delete_category_keeps_posts(
+        admin_client, mixer, user, published_category):
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    run_action(admin_client, "/admin/blog/category/", "delete_selected",
+               [published_category], post="yes")
+    post.refresh_from_db()
+    assert post.category is None, (
+        "Убедитесь, что при удалении категории из админки публикации"
+        " остаются без категории, как при on_delete=SET_NULL."
+    )
+
+
+def test_delete_confirms_logs_and_cleans_up(
+        admin_client, mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        title="Удаляемая публикация")
+    mixer.blend("blog.Comment", post=posts[0], author=user)
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    response = run_action(
+        admin_client, "/admin/blog/post/", "delete_selected", posts)
+    assert response.status_code == 200 and Post.objects.count() == 3, (
+        "Убедитесь, что удаление из админки сначала показывает страницу"
+        " подтверждения."
+    )
+    run_action(admin_client, "/admin/blog/post/", "delete_selected", posts,
+               post="yes")
+    assert not Post.objects.exists()
+    assert LogEntry.objects.filter(action_flag=DELETION).count() == 3, (
+        "Убедитесь, что удаление из админки пишется в журнал действий."
+    )
+    assert not admin_client.get(
+        "/search/", {"q": "удаляемая"}).context["page_obj"], (
+        "Убедитесь, что удалённые публикации пропадают из поиска."
+    )
+    assert not snapshots.get_snapshot(snapshots.GLOBAL_FEED).ids
+
+
+def test_delete_checks_cascade_permissions(client, mixer, user):
+    moderator = mixer.blend("auth.User", is_staff=True)
+    moderator.user_permissions.set(Permission.objects.filter(
+        codename__in=("view_post", "delete_post")))
+    client.force_login(moderator)
+    post = mixer.blend("blog.Post", author=user)
+    mixer.blend("blog.Comment", post=post, author=user)
+    response = run_action(client, "/admin/blog/post/", "delete_selected",
+                          [post], post="yes")
+    assert response.status_code == 403 and Post.objects.exists(), (
+        "Убедитесь, что удаление из админки проверяет права на удаление"
+        " связанных записей."
+    )
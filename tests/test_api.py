@@ -0,0 +1,71 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_api_feeds_follow_site_visibility(
+    client, user, mixer, published_category, post_with_published_location,
+    future_posts,
+):
+    post = post_with_published_location
+    unpublished_post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    for url in (
+        "/api/posts/",
+        f"/api/category/{published_category.slug}/",
+        f"/api/profile/{user.username}/",
+    ):
+        ids = [item["id"] for item in client.get(url).json()["results"]]
+        assert post.id in ids and (
+            future_posts[0].id not in ids
+            and unpublished_post.id not in ids
+        ), (
+            f"Убедитесь, что API по адресу `{url}` показывает те же"
+            " публикации, что и лента на сайте."
+        )
+
+    detail = client.get(f"/api/posts/{post.id}/").json()
+    assert detail["text"] == post.text and detail["title"] == post.title
+    assert client.get(f"/api/posts/{unpublished_post.id}/").status_code == 404
+
+
+def test_api_conditional_get(client, mixer, user, published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category)
+    response = client.get("/api/posts/")
+    etag = response["ETag"]
+    assert etag.startswith('"'), "Убедитесь, что API отдаёт сильный ETag."
+
+    not_modified = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304, (
+        "Убедитесь, что на совпавший `If-None-Match` API отвечает 304."
+    )
+    assert not not_modified.content
+
+    mixer.blend("blog.Post", author=user, category=published_category)
+    changed = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200 and changed["ETag"] != etag, (
+        "Убедитесь, что ETag ленты меняется вместе с публикациями."
+    )
+
+
+def test_api_comments(client, mixer, user, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response = client.get(f"/api/posts/{post.id}/comments/")
+    assert response.json()["results"][0]["text"] == comment.text
+    assert client.get(
+        f"/api/posts/{post.id}/comments/",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    ).status_code == 304
+
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    assert client.get(
+        f"/api/posts/{post.id}/comments/",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    ).status_code == 200, (
+        "Убедитесь, что ETag комментариев меняется при их правке."
+    )
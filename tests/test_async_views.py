@@ -0,0 +1,107 @@
+import asyncio
+from importlib import reload
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+
+import blog.urls
+import blogicum.urls
+import pages.urls
+from blog import async_views
+
+pytestmark = [pytest.mark.django_db]
+
+
+def reload_urls():
+    # Корневой urlconf держит вложенные резолверы с уже прочитанными
+    # маршрутами — перечитываем и его.
+    reload(blog.urls)
+    reload(pages.urls)
+    reload(blogicum.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_client(settings):
+    settings.BLOG_ASYNC_VIEWS = True
+    settings.BLOG_INLINE_SCHEDULER = False
+    reload_urls()
+    yield AsyncClient()
+    settings.BLOG_ASYNC_VIEWS = False
+    reload_urls()
+
+
+def get(client, url, **extra):
+    async def request():
+        return await client.get(url, **extra)
+
+    return async_to_sync(request)()
+
+
+@pytest.fixture
+def read_urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+        f"/profile/{post.author.username}/",
+        "/pages/about/",
+        "/pages/rules/",
+    )
+
+
+def test_read_views_are_async(async_client, read_urls):
+    for url in read_urls:
+        assert asyncio.iscoroutinefunction(resolve(url).func), (
+            f"Убедитесь, что при BLOG_ASYNC_VIEWS страница `{url}`"
+            " обслуживается асинхронным представлением."
+        )
+        response = get(async_client, url)
+        assert response.status_code == 200, (
+            f"Убедитесь, что асинхронная страница `{url}` отвечает кодом 200."
+        )
+
+
+def test_async_pages_show_posts(
+        async_client, read_urls, post_with_published_location):
+    for url in read_urls[:4]:
+        assert post_with_published_location.title in get(
+            async_client, url).content.decode(), (
+            f"Убедитесь, что асинхронная страница `{url}` выводит"
+            " публикации так же, как синхронная."
+        )
+
+
+def test_cached_page_served_without_thread(
+        async_client, read_urls, monkeypatch):
+    get(async_client, "/")
+    calls = []
+    render_view = async_views.render_view
+
+    def counting_render_view(*args, **kwargs):
+        calls.append(args)
+        return render_view(*args, **kwargs)
+
+    monkeypatch.setattr(async_views, "render_view", counting_render_view)
+    with CaptureQueriesContext(connection) as queries:
+        response = get(async_client, "/")
+    assert response.status_code == 200
+    assert not calls and not queries, (
+        "Убедитесь, что закэшированная страница отдаётся анонимному"
+        " посетителю без перехода в поток и запросов к БД."
+    )
+
+
+def test_async_metrics_count_queries(async_client, read_urls, settings):
+    settings.DEBUG = True
+    with CaptureQueriesContext(connection) as queries:
+        response = get(async_client, read_urls[2])
+    assert int(response["X-Query-Count"]) == len(queries) > 0, (
+        "Убедитесь, что под ASGI заголовок `X-Query-Count` учитывает"
+        " запросы к БД, выполненные в потоке представления."
+    )
@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, F, Q
+
+from benchmarks.run import compare
+from blog.models import Comment, Post
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_generate_blog_data(client):
+    call_command(
+        "generate_blog_data", users=5, categories=3, locations=2, posts=40,
+        comments=200, batch_size=7,
+    )
+    assert (User.objects.count(), Post.objects.count(),
+            Comment.objects.count()) == (5, 40, 200)
+    stale = Post.objects.annotate(
+        actual=Count("comments", filter=Q(comments__is_published=True))
+    ).exclude(comment_count=F("actual"))
+    assert not stale.exists(), (
+        "Убедитесь, что `generate_blog_data` пересчитывает счётчики"
+        " комментариев."
+    )
+    top_author = (
+        Post.objects.values("author").annotate(total=Count("pk"))
+        .order_by("-total").first()
+    )
+    assert top_author["total"] > 40 / 5, (
+        "Убедитесь, что авторы публикаций распределены неравномерно."
+    )
+    response = client.get("/search/", {"q": "город"})
+    assert response.context["page_obj"].paginator.count > 0, (
+        "Убедитесь, что сгенерированные публикации попадают в поиск."
+    )
+
+
+def test_compare_detects_regressions():
+    baseline = {"results": {"client": {
+        "blog:index [anonymous]": {"p50_ms": 10, "p99_ms": 20, "rps": 100},
+        "blog:search [anonymous]": {"p50_ms": 0.2, "p99_ms": 0.3, "rps": 50},
+    }}}
+    current = {"results": {"client": {
+        "blog:index [anonymous]": {"p50_ms": 15, "p99_ms": 21, "rps": 70},
+        # Меньше миллисекунды — шум, даже если это вдвое дольше.
+        "blog:search [anonymous]": {"p50_ms": 0.5, "p99_ms": 0.6, "rps": 45},
+        "blog:profile [anonymous]": {"p50_ms": 99, "p99_ms": 99, "rps": 1},
+    }}}
+    regressions = compare(current, baseline, tolerance=0.2)
+    assert regressions == [
+        "client blog:index [anonymous]: p50_ms 10 -> 15",
+        "client blog:index [anonymous]: rps 100 -> 70",
+    ]
+
+
+def test_compare_against_other_mode():
+    baseline = {"results": {"wsgi": {
+        "blog:index [anonymous]": {"p50_ms": 10, "p99_ms": 20, "rps": 100},
+    }}}
+    current = {"results": {"asgi": {
+        "blog:index [anonymous]": {"p50_ms": 15, "p99_ms": 20, "rps": 100},
+    }}}
+    assert compare(current, baseline, tolerance=0.2) == []
+    assert compare(current, baseline, tolerance=0.2, baseline_mode="wsgi") == [
+        "asgi blog:index [anonymous]: p50_ms 10 -> 15",
+    ], (
+        "Убедитесь, что `--baseline-mode` сравнивает ASGI с WSGI-прогоном."
+    )
@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from blog.cache import get_feed_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_cached_and_invalidated(
+        client, post_with_published_location):
+    post = post_with_published_location
+    urls = ("/", f"/posts/{post.id}/", f"/category/{post.category.slug}/")
+    for url in urls:
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert not queries, (
+            f"Убедитесь, что страница `{url}` для анонимного посетителя"
+            " отдаётся из кэша без запросов к БД."
+        )
+
+    post.title = "Новый заголовок публикации"
+    post.save()
+    for url in urls:
+        assert post.title in client.get(url).content.decode(), (
+            f"Убедитесь, что кэш страницы `{url}` сбрасывается при изменении"
+            " публикации."
+        )
+
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in client.get("/").content.decode(), (
+        "Убедитесь, что кэш ленты сбрасывается при снятии категории"
+        " с публикации."
+    )
+
+
+@pytest.mark.parametrize("client_name", ("client", "user_client"))
+def test_html_pages_answer_not_modified(
+        request, client_name, post_with_published_location, mixer):
+    client = request.getfixturevalue(client_name)
+    post = post_with_published_location
+    urls = ("/", f"/posts/{post.id}/", f"/category/{post.category.slug}/")
+    for url in urls:
+        response = client.get(url)
+        assert response.has_header("ETag"), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок `ETag`."
+        )
+        repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert repeat.status_code == 304, (
+            f"Убедитесь, что неизменившаяся страница `{url}` отдаётся"
+            " с кодом 304."
+        )
+
+    etag = client.get(f"/posts/{post.id}/")["ETag"]
+    mixer.blend("blog.Comment", post=post, author=post.author)
+    assert client.get(
+        f"/posts/{post.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы публикации."
+    )
+    # Дата ответа ничего не говорит о комментариях, удалениях и правках
+    # категорий, поэтому одного If-Modified-Since для 304 мало.
+    response = client.get(
+        f"/posts/{post.id}/", HTTP_IF_MODIFIED_SINCE=http_date())
+    assert response.status_code == 200, (
+        "Убедитесь, что страница не отвечает 304 по одному заголовку"
+        " `If-Modified-Since`: дата не меняется при новых комментариях."
+    )
+
+
+def test_login_keeps_feed_version(client, user):
+    user.set_password("password")
+    user.save()
+    version = get_feed_version()
+    assert client.login(username=user.username, password="password")
+    assert get_feed_version() == version, (
+        "Убедитесь, что вход пользователя не сбрасывает кэш лент."
+    )
+    user.first_name = "Новое имя"
+    user.save(update_fields=["first_name"])
+    assert get_feed_version() != version, (
+        "Убедитесь, что смена имени автора сбрасывает кэш лент."
+    )
+
+
+def test_etag_sees_bump_from_other_process(client, db):
+    etag = client.get("/")["ETag"]
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+        "BLOGICUM_CACHE_DIR": settings.CACHES["default"]["LOCATION"],
+    }
+    subprocess.run(
+        [
+            sys.executable, "-c",
+            "import django; django.setup();"
+            " from blog.cache import bump_feed_version;"
+            " bump_feed_version()",
+        ],
+        cwd=Path(settings.BASE_DIR), env=env, check=True,
+    )
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что кэш общий для процессов: после сброса версии лент"
+        " командой в другом процессе главная страница не отвечает 304."
+    )
@@ -0,0 +1,36 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_views(user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/add/", {"text": "Текст"})
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " комментариев публикации."
+    )
+
+    comment = post.comments.get()
+    user_client.post(
+        f"/posts/{post.id}/comment/{comment.id}/delete_comment/")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что удаление комментария уменьшает счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_repair_comment_counts(post_with_published_location, comment_to_a_post):
+    post = post_with_published_location
+    post.refresh_from_db()
+    assert post.comment_count == 0
+
+    call_command("repair_comment_counts", batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что команда `repair_comment_counts` пересчитывает"
+        " счётчики комментариев."
+    )
@@ -0,0 +1,31 @@
+import pytest
+from django.core.management import call_command
+from django.utils.html import escape
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_excerpt_saved_and_backfilled(mixer, user):
+    post = mixer.blend("blog.Post", author=user, text=" ".join(["слово"] * 30))
+    assert post.excerpt == " ".join(["слово"] * 10) + " …", (
+        "Убедитесь, что анонс публикации заполняется при сохранении."
+    )
+
+    Post.objects.filter(pk=post.pk).update(excerpt="")
+    call_command("backfill_excerpts", batch_size=1)
+    post.refresh_from_db()
+    assert post.excerpt.startswith("слово"), (
+        "Убедитесь, что команда `backfill_excerpts` заполняет пустые анонсы."
+    )
+
+
+def test_feed_does_not_load_text(client, post_with_published_location):
+    response = client.get("/")
+    post = response.context["page_obj"][0]
+    assert "text" in post.get_deferred_fields(), (
+        "Убедитесь, что лента не загружает полный текст публикаций."
+    )
+    excerpt = escape(post_with_published_location.excerpt)
+    assert excerpt in response.content.decode()
@@ -0,0 +1,55 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_export_posts_jsonl(post_with_published_location):
+    post = post_with_published_location
+    out = io.StringIO()
+    call_command("export_blog", "posts", stdout=out)
+    (record,) = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert record["id"] == post.pk and record["title"] == post.title
+    assert record["author"] == post.author.username, (
+        "Убедитесь, что в выгрузку попадает имя автора, а не его ключ."
+    )
+    assert record["location"] == post.location.name
+    assert record["category"] == post.category.title
+    assert record["pub_date"] == post.pub_date.isoformat()
+
+
+def test_export_comments_csv_gz(tmp_path, comment):
+    path = tmp_path / "comments.csv.gz"
+    call_command("export_blog", "comments", output=str(path), chunk_size=1)
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert len(rows) == 1, (
+        "Убедитесь, что команда `export_blog` пишет сжатый CSV, если файл"
+        " оканчивается на `.csv.gz`."
+    )
+    assert rows[0]["text"] == comment.text
+    assert rows[0]["post"] == comment.post.title
+    assert rows[0]["author"] == comment.author.username
+
+
+def test_admin_export_streams(
+        admin_client, django_assert_num_queries, post_with_published_location):
+    post = post_with_published_location
+    response = admin_client.post("/admin/blog/post/", {
+        "action": "export_csv",
+        "_selected_action": [post.pk],
+    })
+    assert response.streaming, (
+        "Убедитесь, что выгрузка из админки отдаётся потоком."
+    )
+    assert "attachment" in response["Content-Disposition"]
+    # Все имена приходят одним запросом с JOIN.
+    with django_assert_num_queries(1):
+        content = b"".join(response.streaming_content).decode()
+    header, row = list(csv.reader(io.StringIO(content)))
+    assert row[header.index("author")] == post.author.username
@@ -0,0 +1,86 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import default_storage
+
+from blog import const, jobs
+from blog.models import Post
+from blog.renditions import (
+    RENDITION_FORMATS,
+    RENDITION_WIDTHS,
+    sync_renditions,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_image_job_runs_off_request(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    job = jobs.schedule_renditions(post)
+    assert jobs.schedule_renditions(post) == job, (
+        "Убедитесь, что повторная загрузка изображения не ставит в очередь"
+        " вторую задачу для той же публикации."
+    )
+    post.refresh_from_db()
+    assert post.image_status == Post.IMAGE_PENDING
+    assert not post.image_renditions
+
+    soup = BeautifulSoup(
+        user_client.get(f"/posts/{post.id}/").content, "html.parser")
+    assert soup.find("picture").find("img")["src"] == post.image.url, (
+        "Убедитесь, что пока изображение обрабатывается, на странице"
+        " выводится исходный файл."
+    )
+
+    claimed = jobs.claim_jobs(const.IMAGE_JOB_CONCURRENCY)
+    assert claimed == [job] and jobs.claim_jobs(1) == [], (
+        "Убедитесь, что задачу из очереди может забрать только один"
+        " обработчик."
+    )
+    assert jobs.run_job(claimed[0])
+    post.refresh_from_db()
+    job.refresh_from_db()
+    assert post.image_status == Post.IMAGE_READY and job.status == "done"
+    assert set(post.image_renditions) == set(RENDITION_WIDTHS)
+
+
+def test_image_job_retries_then_fails(
+        monkeypatch, post_with_published_location):
+    def broken(post):
+        raise OSError("cannot identify image file")
+
+    monkeypatch.setattr(jobs, "sync_renditions", broken)
+    post = post_with_published_location
+    job = jobs.schedule_renditions(post)
+    for attempt in range(1, const.IMAGE_JOB_MAX_ATTEMPTS + 1):
+        job.run_after = job.created_at
+        job.save(update_fields=["run_after"])
+        (job,) = jobs.claim_jobs(1)
+        assert job.attempts == attempt
+        assert not jobs.run_job(job)
+    job.refresh_from_db()
+    post.refresh_from_db()
+    assert job.status == "failed" and "cannot identify" in job.last_error, (
+        "Убедитесь, что после исчерпания попыток задача помечается"
+        " как неудачная и хранит текст ошибки."
+    )
+    assert post.image_status == Post.IMAGE_FAILED
+
+
+def test_cleared_image_deletes_renditions(post_with_published_location):
+    post = post_with_published_location
+    sync_renditions(post)
+    files = [
+        rendition[extension]
+        for rendition in post.image_renditions.values()
+        for extension in RENDITION_FORMATS
+    ]
+    post.image = None
+    post.save()
+    jobs.schedule_renditions(post)
+    post.refresh_from_db()
+    assert not post.image_renditions
+    assert not any(map(default_storage.exists, files)), (
+        "Убедитесь, что после удаления изображения из публикации его"
+        " уменьшенные копии удаляются из хранилища."
+    )
@@ -0,0 +1,67 @@
+import gzip
+import json
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_load_db_json(client):
+    call_command("load_blog_dump", str(settings.BASE_DIR / "db.json"))
+    dump = json.loads((settings.BASE_DIR / "db.json").read_text())
+    posts = [record for record in dump if record["model"] == "blog.post"]
+    assert Post.objects.count() == len(posts), (
+        "Убедитесь, что команда `load_blog_dump` загружает все публикации"
+        " из `db.json`."
+    )
+    post = Post.objects.get(pk=posts[0]["pk"])
+    assert post.title == posts[0]["fields"]["title"]
+    assert post.created_at.isoformat().startswith(
+        posts[0]["fields"]["created_at"][:19]), (
+        "Убедитесь, что при загрузке сохраняются даты из дампа."
+    )
+    assert post.excerpt and post.status == "published"
+    response = client.get("/search/", {"q": post.title})
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что загруженные публикации попадают в поисковый индекс."
+    )
+
+
+def test_load_jsonl_append(
+        tmp_path, user, published_category, post_with_published_location):
+    post = post_with_published_location
+    records = [
+        {"model": "blog.category", "pk": published_category.pk, "fields": {
+            "title": "Новая", "slug": "new-category", "description": "-",
+            "is_published": True, "created_at": "2024-01-01T00:00:00Z",
+        }},
+        {"model": "blog.post", "pk": post.pk, "fields": {
+            "title": "Загружено", "text": "Текст", "author": user.pk,
+            "category": published_category.pk,
+            "pub_date": "2024-01-01T00:00:00Z", "is_published": True,
+            "created_at": "2024-01-01T00:00:00Z",
+        }},
+        {"model": "blog.comment", "pk": 1, "fields": {
+            "post": post.pk, "author": user.pk, "text": "Первый",
+            "is_published": True, "created_at": "2024-01-01T00:00:00Z",
+        }},
+    ]
+    path = tmp_path / "dump.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as dump:
+        dump.writelines(json.dumps(record) + "\n" for record in records)
+
+    call_command("load_blog_dump", str(path), append=True, batch_size=1)
+    loaded = Post.objects.get(title="Загружено")
+    assert loaded.pk != post.pk, (
+        "Убедитесь, что с `--append` записи получают новые ключи."
+    )
+    assert loaded.category == Category.objects.get(slug="new-category"), (
+        "Убедитесь, что с `--append` внешние ключи ссылаются на записи,"
+        " загруженные из того же дампа."
+    )
+    assert Comment.objects.get(text="Первый").post == loaded
+    assert loaded.comment_count == 1
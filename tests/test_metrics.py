@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.metrics import registry
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+
+
+def test_debug_headers(client, settings, post_with_published_location):
+    settings.DEBUG = True
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert int(response["X-Query-Count"]) == len(queries), (
+        "Убедитесь, что заголовок `X-Query-Count` содержит число запросов"
+        " к БД за время ответа."
+    )
+    assert "tpl;dur=" in response["Server-Timing"]
+
+
+def test_no_headers_without_debug(client):
+    response = client.get("/")
+    assert "Server-Timing" not in response
+    assert "X-Query-Count" not in response
+
+
+def test_stats_for_staff_only(client, admin_client, user_client):
+    client.get("/")
+    client.get("/")
+    assert user_client.get("/metrics/").status_code == 302, (
+        "Убедитесь, что статистика запросов доступна только персоналу."
+    )
+    stats = admin_client.get("/metrics/").json()["views"]
+    index = stats["blog:index"]
+    assert index["requests"] == 2
+    assert sum(index["latency_ms"].values()) == 2
+    assert index["avg_template_ms"] > 0, (
+        "Убедитесь, что учитывается время отрисовки шаблонов."
+    )
+
+
+def test_slow_requests_logged(client, settings, caplog):
+    settings.BLOG_SLOW_REQUEST_MS = 0
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        client.get("/")
+    (record,) = caplog.records
+    assert "blog:index" in record.getMessage()
+    assert "SELECT" in record.getMessage(), (
+        "Убедитесь, что в журнал медленных запросов попадает список SQL."
+    )
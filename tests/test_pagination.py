@@ -0,0 +1,81 @@
+import pytest
+from django.test import override_settings
+
+from blog import const
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pages(user_client, many_posts_with_published_locations):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    seen, pages, url = [], [], "/"
+    while url:
+        page = user_client.get(url).context["page_obj"]
+        pages.append(url)
+        seen.extend(post.pk for post in page)
+        url = page.has_next() and f"/?cursor={page.next_cursor}"
+    assert seen == [post.pk for post in expected], (
+        "Убедитесь, что при постраничном выводе по курсору публикации"
+        " не теряются, не повторяются и идут от новых к старым."
+    )
+
+    page = user_client.get(pages[-1]).context["page_obj"]
+    previous = user_client.get(f"/?cursor={page.previous_cursor}")
+    assert [post.pk for post in previous.context["page_obj"]] == (
+        seen[-len(page) - len(previous.context["page_obj"]):-len(page)]
+    ), "Убедитесь, что ссылка на предыдущую страницу ведёт на неё."
+
+    assert user_client.get("/?cursor=garbage").status_code == 404
+
+
+def test_page_links_are_windowed(
+        client, mixer, user, published_category, settings):
+    settings.BLOG_CURSOR_PAGINATION = False
+    mixer.cycle(200).blend(
+        "blog.Post", author=user, category=published_category)
+    response = client.get("/?page=10")
+    page_range = list(response.context["page_range"])
+    assert len(page_range) < 12 and 10 in page_range, (
+        "Убедитесь, что пагинатор выводит ссылки только на соседние"
+        " страницы, а не на все страницы ленты."
+    )
+
+
+def test_comments_load_by_cursor(
+        client, mixer, user, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(const.COMMENTS_PAGINATE_BY * 2 + 1).blend(
+        "blog.Comment", post=post, author=user)
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [comment.pk for comment in page] == [
+        comment.pk for comment in comments[:const.COMMENTS_PAGINATE_BY]
+    ], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " порция комментариев, от старых к новым."
+    )
+
+    seen, url = [comment.pk for comment in page], (
+        f"/posts/{post.id}/comments/?format=json&cursor={page.next_cursor}")
+    while url:
+        data = client.get(url).json()
+        seen.extend(comment["id"] for comment in data["results"])
+        url = data["next_cursor"] and (
+            f"/posts/{post.id}/comments/?format=json"
+            f"&cursor={data['next_cursor']}"
+        )
+    assert seen == [comment.pk for comment in comments], (
+        "Убедитесь, что кнопка «Показать ещё» подгружает остальные"
+        " комментарии без пропусков и повторов."
+    )
+
+    fragment = client.get(
+        f"/posts/{post.id}/comments/?cursor={page.next_cursor}")
+    assert fragment.status_code == 200
+    next_comment = comments[const.COMMENTS_PAGINATE_BY]
+    assert f'name="comment_{next_comment.pk}"' in fragment.content.decode()
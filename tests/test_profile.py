@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def author_posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+    visible = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=past, comment_count=3,
+    )
+    draft = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=past,
+    )
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1),
+    )
+    return visible, draft, scheduled
+
+
+def profile_ids(client, user):
+    response = client.get(f"/profile/{user.username}/")
+    return {post.pk for post in response.context["page_obj"]}
+
+
+def test_owner_sees_drafts_and_scheduled(
+        client, user_client, user, author_posts, settings):
+    settings.BLOG_INLINE_SCHEDULER = False
+    visible, draft, scheduled = author_posts
+    assert profile_ids(user_client, user) == {
+        post.pk for post in (*visible, draft, scheduled)}, (
+        "Убедитесь, что автор видит на своей странице черновики и отложенные"
+        " публикации."
+    )
+    assert profile_ids(client, user) == {post.pk for post in visible}
+
+
+def test_profile_stats(user_client, user, author_posts):
+    content = user_client.get(f"/profile/{user.username}/").content.decode()
+    assert "Публикаций: 2" in content and "Комментариев к ним: 6" in content, (
+        "Убедитесь, что в шапке профиля выводятся число видимых публикаций"
+        " автора и комментариев к ним."
+    )
+
+
+def test_profile_header_is_cached(user_client, user, author_posts):
+    url = f"/profile/{user.username}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get(url)
+    assert not any("SUM(" in query["sql"] for query in queries), (
+        "Убедитесь, что шапка профиля со счётчиками берётся из кэша"
+        " фрагментов."
+    )
+    user.first_name = "Новое имя"
+    user.save()
+    assert "Новое имя" in user_client.get(url).content.decode(), (
+        "Убедитесь, что кэш шапки профиля сбрасывается при изменении"
+        " пользователя."
+    )
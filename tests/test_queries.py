@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+def test_feed_queries_do_not_depend_on_page_size(
+    client, user_client, mixer, user, published_category, published_location,
+    feed_urls, settings,
+):
+    settings.BLOG_INLINE_SCHEDULER = False
+
+    def blend_posts(n):
+        mixer.cycle(n).blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location,
+        )
+
+    blend_posts(1)
+    expected = {
+        url: (count_queries(client, url), count_queries(user_client, url))
+        for url in feed_urls
+    }
+    blend_posts(N_PER_PAGE)
+    for url in feed_urls:
+        actual = (count_queries(client, url), count_queries(user_client, url))
+        assert actual == expected[url], (
+            f"Убедитесь, что число запросов к БД на странице `{url}` не"
+            " зависит от числа публикаций на ней: автор, категория и"
+            " местоположение должны загружаться вместе с публикацией."
+        )
+
+
+@pytest.mark.parametrize(
+    "method, url_template, num_queries",
+    (
+        # Сессия и пользователь, категория и сама страница: число
+        # публикаций и их порядок берутся из снимка ленты.
+        ("get", "/category/{category}/", 4),
+        # Сессия и пользователь, автор профиля, COUNT(*), страница и
+        # счётчики автора для шапки, пока её нет в кэше фрагментов.
+        ("get", "/profile/{username}/", 6),
+        # Сессия и пользователь, публикация, списки категорий и
+        # местоположений для формы.
+        ("get", "/posts/{post}/edit/", 5),
+        # Сессия и пользователь, публикация и её местоположение в шаблоне.
+        ("get", "/posts/{post}/delete/", 4),
+        # Сессия и пользователь, публикация, каскад комментариев и
+        # очереди изображений, удаление из таблицы и поискового индекса.
+        ("post", "/posts/{post}/delete/", 7),
+    ),
+)
+def test_views_look_up_objects_once(
+    user_client, django_assert_num_queries, settings, user,
+    published_category, post_with_published_location,
+    method, url_template, num_queries,
+):
+    settings.BLOG_INLINE_SCHEDULER = False
+    url = url_template.format(
+        category=published_category.slug,
+        username=user.username,
+        post=post_with_published_location.id,
+    )
+    with django_assert_num_queries(num_queries):
+        response = getattr(user_client, method)(url)
+    assert response.status_code in (200, 302)
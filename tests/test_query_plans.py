@@ -0,0 +1,110 @@
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+
+from blog.models import Post
+from blog.paginators import (
+    CommentCursorPaginator,
+    CursorPaginator,
+    encode_cursor,
+)
+from blog.views import (
+    CategoryPostListView,
+    PostDetailView,
+    PostListView,
+    ProfileView,
+)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Проверка планов написана для EXPLAIN QUERY PLAN SQLite.",
+    ),
+]
+
+# Обход индекса по порядку с LIMIT допустим, полный просмотр таблицы — нет.
+FULL_SCAN = re.compile(r"\bSCAN (TABLE )?(?P<table>\w+)\b(?! USING)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+
+def get_view(view_cls, user=None, **kwargs):
+    request = RequestFactory().get("/")
+    request.user = user or AnonymousUser()
+    view = view_cls()
+    view.setup(request, **kwargs)
+    return view
+
+
+def assert_indexed_plan(queryset, page_name):
+    plan = queryset.explain()
+    full_scan = FULL_SCAN.search(plan)
+    assert not full_scan, (
+        f"Запрос {page_name} выполняет полный просмотр таблицы"
+        f" `{full_scan and full_scan.group('table')}`:\n{plan}"
+    )
+    assert not TEMP_SORT.search(plan), (
+        f"Запрос {page_name} сортирует строки во временном B-дереве вместо"
+        f" чтения по индексу:\n{plan}"
+    )
+
+
+def test_index_plan():
+    queryset = get_view(PostListView).get_queryset()
+    assert_indexed_plan(queryset, "главной страницы")
+
+
+def test_cursor_plan(post_with_published_location):
+    paginator = CursorPaginator(get_view(PostListView).get_queryset(), 10)
+    for reverse in (False, True):
+        cursor = encode_cursor(post_with_published_location, reverse)
+        _, queryset = paginator.get_page_queryset(cursor)
+        assert_indexed_plan(queryset, "страницы ленты по курсору")
+        assert "SEARCH blog_post" in queryset.explain(), (
+            "Убедитесь, что страница ленты по курсору начинает чтение"
+            " индекса с позиции курсора, а не с начала ленты."
+        )
+
+
+def test_category_plan(published_category):
+    view = get_view(
+        CategoryPostListView, category_slug=published_category.slug)
+    assert_indexed_plan(view.get_queryset(), "страницы категории")
+
+
+def test_profile_plan(user, another_user):
+    view = get_view(ProfileView, username=user.username)
+    assert_indexed_plan(view.get_queryset(), "чужой страницы пользователя")
+    view = get_view(ProfileView, user=user, username=user.username)
+    assert_indexed_plan(view.get_queryset(), "своей страницы пользователя")
+
+
+def test_author_stats_plan(user):
+    queryset = Post.objects.published().filter(author=user)
+    plan = queryset.explain()
+    assert "post_author_visible_idx" in plan, (
+        "Убедитесь, что счётчики автора читаются по индексу его видимых"
+        f" публикаций:\n{plan}"
+    )
+
+
+def test_detail_plan(mixer, user, post_with_published_location):
+    post_id = post_with_published_location.id
+    for current_user in (None, user):
+        view = get_view(PostDetailView, user=current_user, post_id=post_id)
+        # get_object_or_404() сбрасывает сортировку, как и QuerySet.get().
+        assert_indexed_plan(
+            view.get_queryset().filter(pk=post_id).order_by(),
+            "страницы публикации",
+        )
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user)
+    comments = CommentCursorPaginator(
+        post_with_published_location.comments.filter(is_published=True), 10)
+    for cursor in (None, comments.encode_cursor(comment)):
+        _, queryset = comments.get_page_queryset(cursor)
+        assert_indexed_plan(queryset, "комментариев к публикации")
+
@@ -0,0 +1,61 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from blog.cache import get_feed_version
+from blog.renditions import RENDITION_WIDTHS, sync_renditions
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_renditions_served_with_dimensions(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    sync_renditions(post)
+    assert set(post.image_renditions) == set(RENDITION_WIDTHS)
+    for name, rendition in post.image_renditions.items():
+        assert rendition["width"] <= RENDITION_WIDTHS[name]
+        assert default_storage.exists(rendition["webp"])
+        assert default_storage.exists(rendition["jpeg"])
+
+    for url in ("/", f"/posts/{post.id}/"):
+        soup = BeautifulSoup(user_client.get(url).content, "html.parser")
+        img = soup.find("picture").find("img")
+        assert img.get("width") and img.get("height"), (
+            f"Убедитесь, что на странице `{url}` у картинки публикации"
+            " указаны размеры."
+        )
+        assert soup.find("source", type="image/webp"), (
+            f"Убедитесь, что на странице `{url}` картинка публикации"
+            " предлагается в формате WebP через `srcset`."
+        )
+
+
+def test_generate_renditions_command(post_with_published_location):
+    post = post_with_published_location
+    assert not post.image_renditions
+    version = get_feed_version()
+    call_command("generate_renditions", workers=1)
+    assert get_feed_version() != version, (
+        "Убедитесь, что команда `generate_renditions` сбрасывает кэш лент."
+    )
+    post.refresh_from_db()
+    assert set(post.image_renditions) == set(RENDITION_WIDTHS), (
+        "Убедитесь, что команда `generate_renditions` создаёт уменьшенные"
+        " копии изображений."
+    )
+
+
+def test_generate_renditions_streams(mixer, user, published_category,
+                                     post_with_published_location):
+    image = post_with_published_location.image
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category, image=image)
+    call_command("generate_renditions", workers=1, batch_size=2)
+    for post in (post_with_published_location, *posts):
+        post.refresh_from_db()
+        assert set(post.image_renditions) == set(RENDITION_WIDTHS), (
+            "Убедитесь, что команда `generate_renditions` обрабатывает все"
+            " публикации, сколько бы их ни было в одной порции."
+        )
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_publish_scheduled(user_client, settings, mixer, user,
+                           published_category):
+    settings.BLOG_INLINE_SCHEDULER = False
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert post.status == "scheduled", (
+        "Убедитесь, что публикация с датой в будущем получает статус"
+        " `scheduled`."
+    )
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    assert post not in user_client.get("/").context["page_obj"]
+
+    call_command("publish_scheduled")
+    post.refresh_from_db()
+    assert post.status == "published"
+    assert post in user_client.get("/").context["page_obj"], (
+        "Убедитесь, что команда `publish_scheduled` выводит наступившие"
+        " отложенные публикации в ленту."
+    )
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+
+from blog.search import get_search_backend
+
+pytestmark = [pytest.mark.django_db]
+
+
+def search_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_stems_ranks_and_hides(
+        client, mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title=title, text=text, **kwargs
+        )
+
+    in_title = blend("Публикации о горах", "Текст без ключевых слов.")
+    in_text = blend("Заметка", "Здесь рассказано о новой публикации.")
+    hidden = blend("Скрытая публикация", "Текст.", is_published=False)
+    blend("Другое", "Совсем о другом.")
+
+    assert search_ids(client, "публикация") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит разные формы слова, ставит совпадения"
+        " в заголовке выше и не показывает скрытые публикации."
+    )
+    assert hidden.id not in search_ids(client, "скрытая")
+
+    in_text.text = "Теперь про реки."
+    in_text.save()
+    assert search_ids(client, "реки") == [in_text.id], (
+        "Убедитесь, что поисковый индекс обновляется при сохранении"
+        " публикации."
+    )
+    in_text.delete()
+    assert search_ids(client, "реки") == []
+
+
+def test_reindex_search_command(mixer, user, published_category, client):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Горные вершины",
+    )
+    get_search_backend().clear()
+    assert search_ids(client, "вершина") == []
+    call_command("reindex_search", batch_size=1)
+    assert search_ids(client, "вершина") == [post.id], (
+        "Убедитесь, что команда `reindex_search` заполняет поисковый индекс."
+    )
+
+
+def test_missing_stemmer_is_logged(monkeypatch, caplog):
+    from blog import search
+
+    monkeypatch.setattr(search, "snowballstemmer", None)
+    search.get_stemmer.cache_clear()
+    try:
+        assert search.stem_words("Публикации") == ["публикации"]
+    finally:
+        search.get_stemmer.cache_clear()
+    assert "snowballstemmer" in caplog.text, (
+        "Убедитесь, что поиск без стеммера предупреждает об этом в логе."
+    )
@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog import const, snapshots
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, 6)),
+    )
+
+
+def snapshot_ids(feed):
+    return snapshots.get_snapshot(feed).ids
+
+
+def page_ids(client, url):
+    return [post.pk for post in client.get(url).context["page_obj"]]
+
+
+def test_snapshot_matches_feed_order(feed_posts, published_category):
+    expected = [post.pk for post in feed_posts]
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == expected
+    assert snapshot_ids(
+        snapshots.category_feed(published_category.pk)) == expected
+
+
+def test_feed_page_reads_rows_by_snapshot(
+        client, feed_posts, django_assert_max_num_queries, settings):
+    settings.BLOG_INLINE_SCHEDULER = False
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    # Только строки страницы по ключам — без COUNT(*).
+    with django_assert_max_num_queries(1):
+        response = client.get("/")
+    assert [post.pk for post in response.context["page_obj"]] == [
+        post.pk for post in feed_posts]
+
+
+def test_unpublish_and_publish_update_snapshot(client, feed_posts):
+    post = feed_posts[2]
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    post.is_published = False
+    post.save()
+    assert post.pk not in snapshot_ids(snapshots.GLOBAL_FEED), (
+        "Убедитесь, что снятая с публикации запись пропадает из снимка ленты."
+    )
+    post.is_published = True
+    post.save()
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == [
+        post.pk for post in feed_posts], (
+        "Убедитесь, что вновь опубликованная запись встаёт в снимок ленты"
+        " на своё место по дате."
+    )
+
+
+def test_moving_post_between_categories(
+        feed_posts, published_category, another_category):
+    post = feed_posts[0]
+    old_feed = snapshots.category_feed(published_category.pk)
+    new_feed = snapshots.category_feed(another_category.pk)
+    snapshots.get_snapshot(old_feed)
+    post.category = another_category
+    post.save()
+    assert post.pk not in snapshot_ids(old_feed)
+    assert snapshot_ids(new_feed) == [post.pk]
+
+
+def test_category_toggle_updates_global_snapshot(
+        feed_posts, published_category):
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    published_category.is_published = False
+    published_category.save()
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == [], (
+        "Убедитесь, что публикации скрытой категории пропадают из снимка"
+        " главной ленты."
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == [
+        post.pk for post in feed_posts]
+
+
+def test_deleted_post_leaves_snapshot(feed_posts):
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    feed_posts[0].delete()
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == [
+        post.pk for post in feed_posts[1:]]
+
+
+def test_stale_snapshot_never_shows_hidden_posts(client, feed_posts):
+    hidden = feed_posts[0]
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    # Правка в обход сигналов: снимок о ней не знает.
+    Post.objects.filter(pk=hidden.pk).update(is_visible=False)
+    assert hidden.pk not in page_ids(client, "/"), (
+        "Убедитесь, что лента перепроверяет видимость публикаций из снимка."
+    )
+
+
+def test_invalidate_rebuilds_snapshots(feed_posts):
+    snapshots.get_snapshot(snapshots.GLOBAL_FEED)
+    Post.objects.filter(pk=feed_posts[0].pk).update(is_visible=False)
+    snapshots.invalidate_snapshots()
+    assert feed_posts[0].pk not in snapshot_ids(snapshots.GLOBAL_FEED)
+
+
+def test_snapshot_window_falls_back_to_database(
+        client, mixer, user, published_category, settings, monkeypatch):
+    settings.BLOG_INLINE_SCHEDULER = False
+    monkeypatch.setattr(const, "FEED_SNAPSHOT_SIZE", 3)
+    now = timezone.now()
+    posts = mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, 13)),
+    )
+    assert not snapshots.get_snapshot(snapshots.GLOBAL_FEED).complete
+    assert page_ids(client, "/") == [post.pk for post in posts[:10]]
+    assert page_ids(client, "/?page=2") == [posts[10].pk, posts[11].pk], (
+        "Убедитесь, что страницы за пределами снимка читаются из БД."
+    )
+
+
+def test_evicted_generation_does_not_revive_snapshots(feed_posts):
+    stale = snapshot_ids(snapshots.GLOBAL_FEED)
+    snapshots.invalidate_snapshots()
+    feed_posts[0].delete()
+    caches["default"].delete(snapshots.GENERATION_KEY)
+    assert snapshot_ids(snapshots.GLOBAL_FEED) == stale[1:], (
+        "Убедитесь, что после вытеснения ключа поколения из кэша снимки"
+        " прежних поколений не используются снова."
+    )
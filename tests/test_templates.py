@@ -0,0 +1,31 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from blog.metrics import profile_templates
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_cards_render_in_one_template(
+        client, many_posts_with_published_locations):
+    with profile_templates() as stats:
+        response = client.get("/")
+    assert response.status_code == 200
+    assert stats["includes/post_list.html"].calls == 1, (
+        "Убедитесь, что карточки ленты отрисовываются одним шаблоном,"
+        " без include на каждую публикацию."
+    )
+    index = stats["blog/index.html"]
+    assert 0 < index.own <= index.total
+
+
+def test_profile_templates_command(post_with_published_location):
+    out = io.StringIO()
+    call_command("profile_templates", "/", repeat=2, stdout=out)
+    report = out.getvalue()
+    assert "blog/index.html" in report and "base.html" in report, (
+        "Убедитесь, что команда `profile_templates` выводит время каждого"
+        " шаблона страницы."
+    )
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.scheduler import publish_due_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def is_visible(post):
+    return Post.objects.values_list("is_visible", flat=True).get(pk=post.pk)
+
+
+@pytest.fixture
+def visible_posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_feed_query_does_not_join_category():
+    sql = str(Post.objects.published().query)
+    assert "blog_category" not in sql, (
+        "Убедитесь, что видимость публикаций в лентах проверяется по полю"
+        " `is_visible`, без JOIN с категорией."
+    )
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ({}, True),
+    ({"is_published": False}, False),
+    ({"category__is_published": False}, False),
+    ({"category": None}, False),
+    ({"pub_date": timezone.now() + timedelta(days=1)}, False),
+])
+def test_save_sets_visibility(mixer, user, fields, expected):
+    values = {
+        "is_published": True,
+        "category__is_published": True,
+        "pub_date": timezone.now() - timedelta(days=1),
+        **fields,
+    }
+    post = mixer.blend("blog.Post", author=user, **values)
+    assert is_visible(post) is expected
+
+
+def test_update_fields_keep_visibility_in_sync(visible_posts):
+    post = visible_posts[0]
+    post.is_published = False
+    post.save(update_fields=["is_published"])
+    assert not is_visible(post), (
+        "Убедитесь, что `save(update_fields=...)` пересчитывает"
+        " `is_visible`."
+    )
+
+
+def test_category_toggle_is_one_update(visible_posts, published_category):
+    published_category.is_published = False
+    with CaptureQueriesContext(connection) as queries:
+        published_category.save()
+    updates = [
+        query for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что видимость публикаций категории пересчитывается"
+        " одним UPDATE."
+    )
+    assert not any(map(is_visible, visible_posts))
+    published_category.is_published = True
+    published_category.save()
+    assert all(map(is_visible, visible_posts)), (
+        "Убедитесь, что публикации снова видны после публикации категории."
+    )
+
+
+def test_category_delete_hides_posts(visible_posts, published_category):
+    published_category.delete()
+    assert not any(map(is_visible, visible_posts))
+
+
+def test_scheduler_makes_posts_visible(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert not is_visible(post)
+    publish_due_posts(now=timezone.now() + timedelta(hours=2))
+    assert is_visible(post), (
+        "Убедитесь, что планировщик делает наступившие публикации видимыми."
+    )
+
+
+def test_category_admin_actions(
+        admin_client, visible_posts, published_category):
+    def run(action):
+        return admin_client.post("/admin/blog/category/", {
+            "action": action,
+            "_selected_action": [published_category.pk],
+            "index": 0,
+            "post": "yes",
+        })
+
+    run("unpublish_selected")
+    assert not any(map(is_visible, visible_posts)), (
+        "Убедитесь, что снятие категорий с публикации в админке скрывает"
+        " их публикации."
+    )
+    run("publish_selected")
+    assert all(map(is_visible, visible_posts))
+    run("delete_selected")
+    assert not Post.objects.filter(is_visible=True).exists()
+
+
+def test_post_admin_actions_follow_changelist_filter(admin_client, mixer,
+                                                     user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1),
+    )
+    admin_client.post("/admin/blog/post/?is_published__exact=0", {
+        "action": "publish_selected",
+        "_selected_action": [posts[0].pk],
+        "select_across": 1,
+        "index": 0,
+    })
+    assert all(map(is_visible, posts)), (
+        "Убедитесь, что массовая публикация в админке делает видимыми все"
+        " выбранные публикации."
+    )
+
+
+def test_category_admin_actions_follow_changelist_filter(
+        admin_client, visible_posts, published_category):
+    admin_client.post("/admin/blog/category/?is_published__exact=1", {
+        "action": "unpublish_selected",
+        "_selected_action": [published_category.pk],
+        "select_across": 1,
+        "index": 0,
+    })
+    assert not any(map(is_visible, visible_posts)), (
+        "Убедитесь, что снятие с публикации категорий, отобранных фильтром"
+        " списка в админке, скрывает их публикации."
+    )